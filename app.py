@@ -8,160 +8,651 @@ Routes:
     /bulk-test - Run all default images
     /single-test - Test a custom image
     /results - Display test results
+    /api/bulk-test-results - Results of the current bulk run (JSON)
 """
 
-from flask import Flask, render_template_string, request, jsonify, session
+from flask import Flask, Response, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 import docker
+import jinja2
+from markupsafe import Markup, escape
 import json
+import os
+import hashlib
+import argparse
 import time
-import statistics
 import threading
 import sys
-import io
+import codecs
+import functools
+import gzip
+import zlib
+import uuid
+import secrets
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime
 
-# Fix encoding for Windows
+# The samplers, stats parsing and instance tiers are shared with the CLI estimator
+from docker_resource_estimator import (
+    add_sample, summary_mean, find_cgroup_paths, cgroup_samples,
+    docker_api_samples, get_instance_recommendations
+)
+
+# orjson parses the stats frames straight from bytes and is several times
+# faster than the stdlib; fall back to json when it isn't installed
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    json_loads = json.loads
+
+# waitress is a threaded production WSGI server that also runs on Windows;
+# without it the app falls back to Flask's built-in server
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
+
+# Brotli packs the pre-rendered pages smaller than gzip; without it they are
+# only offered gzipped
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Fix encoding for Windows; reconfigure() rather than a new wrapper, since the
+# estimator module does the same on import
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
 
 app = Flask(__name__)
 app.secret_key = 'docker_resource_estimator_secret_key_2025'
 
+
+if orjson is not None:
+    class OrjsonProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by orjson."""
+        
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default).decode('utf-8')
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+    
+    app.json = OrjsonProvider(app)
+
+# Shared read-only default for missing sections of a stats frame
+EMPTY = {}
+
+# Keeps a container with nothing else to do alive while it is measured
+KEEP_ALIVE_COMMAND = "tail -f /dev/null"
+
+
+@dataclass(frozen=True, slots=True)
+class TestImage:
+    """
+    One entry of the bulk test configuration.
+    command None runs the image's own CMD, so servers and databases are measured
+    doing their real work; environment is a tuple of (name, value) pairs.
+    """
+    name: str
+    command: str | None
+    description: str
+    category: str
+    environment: tuple = ()
+
+
+# Default test images configuration
+DEFAULT_TEST_IMAGES = (
+    TestImage("nginx:latest", "nginx -g 'daemon off;'", "Nginx Web Server", "Web Servers"),
+    TestImage("httpd:latest", "httpd-foreground", "Apache HTTP Server", "Web Servers"),
+    TestImage("redis:latest", "redis-server", "Redis Cache", "Databases"),
+    TestImage("postgres:latest", None, "PostgreSQL Database", "Databases",
+              environment=(("POSTGRES_PASSWORD", "estimator"),)),
+    TestImage("mysql:latest", None, "MySQL Database", "Databases",
+              environment=(("MYSQL_ROOT_PASSWORD", "estimator"),)),
+    TestImage("python:3.11", "sleep 3600", "Python 3.11", "Languages"),
+    TestImage("node:18", "sleep 3600", "Node.js 18", "Languages"),
+    TestImage("openjdk:17", "jshell", "OpenJDK 17", "Languages"),
+    TestImage("alpine:latest", KEEP_ALIVE_COMMAND, "Alpine Linux", "Base Images"),
+    TestImage("ubuntu:latest", KEEP_ALIVE_COMMAND, "Ubuntu Linux", "Base Images"),
+)
+
+# Live test presets: dropdown label, image, command, port mapping, description.
+# The live page lists them and gets a JSON copy for filling in the form
+LIVE_TEST_PRESETS = {
+    'mobsf': {
+        'label': 'MobSF - Mobile Security Framework (Port 8000)',
+        'image': 'opensecurity/mobile-security-framework-mobsf:latest',
+        'command': '',
+        'port': '8000:8000',
+        'info': 'MobSF (Mobile Security Framework) - An automated, all-in-one mobile application security assessment framework. Access at http://localhost:8000 with credentials mobsf/mobsf. Perfect for stress testing mobile app analysis workloads.'
+    },
+    'nginx': {
+        'label': 'Nginx Web Server (Port 80)',
+        'image': 'nginx:latest',
+        'command': "nginx -g 'daemon off;'",
+        'port': '80:80',
+        'info': 'Nginx - High-performance web server and reverse proxy. Access at http://localhost:80. Great for testing web serving performance.'
+    },
+    'apache': {
+        'label': 'Apache Web Server (Port 80)',
+        'image': 'httpd:latest',
+        'command': 'httpd-foreground',
+        'port': '80:80',
+        'info': 'Apache HTTP Server - Popular open-source web server. Access at http://localhost:80.'
+    },
+    'redis': {
+        'label': 'Redis Cache (Port 6379)',
+        'image': 'redis:latest',
+        'command': 'redis-server',
+        'port': '6379:6379',
+        'info': 'Redis - In-memory data structure store used as cache and message broker. Connect at localhost:6379.'
+    },
+    'postgres': {
+        'label': 'PostgreSQL Database (Port 5432)',
+        'image': 'postgres:latest',
+        'command': '',
+        'port': '5432:5432',
+        'info': 'PostgreSQL - Advanced open-source relational database. Connect at localhost:5432. Note: Set POSTGRES_PASSWORD env var for production.'
+    },
+    'mysql': {
+        'label': 'MySQL Database (Port 3306)',
+        'image': 'mysql:latest',
+        'command': '',
+        'port': '3306:3306',
+        'info': 'MySQL - Popular open-source relational database. Connect at localhost:3306. Note: Set MYSQL_ROOT_PASSWORD env var for production.'
+    },
+    'mongo': {
+        'label': 'MongoDB (Port 27017)',
+        'image': 'mongo:latest',
+        'command': '',
+        'port': '27017:27017',
+        'info': 'MongoDB - NoSQL document database. Connect at localhost:27017.'
+    },
+    'elasticsearch': {
+        'label': 'Elasticsearch (Port 9200)',
+        'image': 'elasticsearch:8.11.0',
+        'command': '',
+        'port': '9200:9200',
+        'info': 'Elasticsearch - Distributed search and analytics engine. Access at http://localhost:9200.'
+    },
+}
+
+# Containers profiled at once during a bulk test: kept low to avoid saturating
+# dockerd, and no more than the host's cores so the samples don't skew each other
+BULK_TEST_WORKERS = min(4, os.cpu_count() or 1, len(DEFAULT_TEST_IMAGES))
+
+# Concurrent image pulls before a bulk run starts measuring
+IMAGE_PULL_WORKERS = 4
+
 # Global variable to store test progress
 test_progress = {
     'status': 'idle',
     'current': 0,
     'total': 0,
     'current_image': '',
-    'results': []
+    'phase': '',  # 'pulling' images, then 'measuring'
+    'results': deque(maxlen=len(DEFAULT_TEST_IMAGES)),
+    'job_id': None,
+    'by_category': {},  # Successful results grouped by category, kept as results arrive
+    'successful': 0,
+    'revision': 0,  # Bumped on every change to results or status
+    'completed_at': ''
 }
 
-# Global variable to store live test containers
+# Guards test_progress while bulk workers update it concurrently
+progress_lock = threading.Lock()
+
+# Immutable (status, phase, current, total, successful, current_image, version)
+# copy of test_progress, replaced whole after every change so the progress
+# poll can read it without taking progress_lock
+progress_view = ('idle', '', 0, 0, 0, '', 'None-0')
+
+# Notified by publish_progress() so /api/bulk-test-stream can push changes
+progress_changed = threading.Condition(progress_lock)
+
+# Seconds between keep-alive comments on an idle progress stream
+PROGRESS_KEEPALIVE = 15
+
+# waitress request threads. Every open progress or live-test stream holds one
+# for as long as the page is open, so leave plenty for ordinary requests
+SERVER_THREADS = 32
+
+# Rendered /results?type=bulk page of a finished run as (html, gzipped html,
+# brotli html or None), keyed by revision
+bulk_results_cache = {}
+
+# Recent single test results by token, oldest first; kept in memory instead
+# of the cookie session so responses don't carry a signed copy of the result
+SINGLE_RESULTS_LIMIT = 32
+single_results = OrderedDict()
+single_results_lock = threading.Lock()
+
+# Global variable to store live test containers. Handlers read it with .get();
+# adding and removing entries takes live_containers_lock
 live_containers = {}
+live_containers_lock = threading.Lock()
 
-# Default test images configuration
-DEFAULT_TEST_IMAGES = [
-    {"name": "nginx:latest", "command": "nginx -g 'daemon off;'", "description": "Nginx Web Server", "category": "Web Servers"},
-    {"name": "httpd:latest", "command": "httpd-foreground", "description": "Apache HTTP Server", "category": "Web Servers"},
-    {"name": "redis:latest", "command": "redis-server", "description": "Redis Cache", "category": "Databases"},
-    {"name": "postgres:latest", "command": None, "description": "PostgreSQL Database", "category": "Databases", "startup_delay": 5},
-    {"name": "mysql:latest", "command": None, "description": "MySQL Database", "category": "Databases"},
-    {"name": "python:3.11", "command": "sleep 3600", "description": "Python 3.11", "category": "Languages"},
-    {"name": "node:18", "command": "sleep 3600", "description": "Node.js 18", "category": "Languages"},
-    {"name": "openjdk:17", "command": "jshell", "description": "OpenJDK 17", "category": "Languages"},
-    {"name": "alpine:latest", "command": None, "description": "Alpine Linux", "category": "Base Images"},
-    {"name": "ubuntu:latest", "command": None, "description": "Ubuntu Linux", "category": "Base Images"},
-]
-
-
-def estimate_single_image(image_name, test_duration=20, custom_command=None):
+# Characters of recent output kept per live container
+LIVE_LOG_LIMIT = 200_000
+
+# Single long-lived worker for bulk runs; only one run is allowed at a time
+bulk_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bulk')
+
+# Shared Docker client, created on first use. Every bulk worker keeps two
+# connections busy (stats plus the exit watcher's wait()), and live tests hold
+# a stats stream each, so the pool is larger than docker-py's default of 10
+DOCKER_POOL_SIZE = 32
+docker_client = None
+docker_client_lock = threading.Lock()
+
+# Images already confirmed present locally (skips the images.get round-trip)
+known_images = set()
+known_images_lock = threading.Lock()
+
+
+def cpu_scale_from_stats(stats):
+    """
+    Return online_cpus * 100 for a stats frame.
+    The CPU count doesn't change over a container's life, so callers compute
+    this once and pass it to cpu_percent_from_stats for every later frame.
+    """
+    cpu_stats = stats.get("cpu_stats") or EMPTY
+    online_cpus = cpu_stats.get("online_cpus")
+    if not online_cpus:
+        percpu_usage = (cpu_stats.get("cpu_usage") or EMPTY).get("percpu_usage")
+        online_cpus = len(percpu_usage) if percpu_usage else 1
+    return online_cpus * 100.0
+
+
+def cpu_totals(cpu_stats):
+    """
+    Return (container CPU ns, system CPU ns) from a frame's cpu_stats section,
+    or None when either counter is missing (e.g. an empty precpu_stats).
+    """
+    try:
+        return cpu_stats["cpu_usage"]["total_usage"], cpu_stats["system_cpu_usage"]
+    except (KeyError, TypeError):
+        return None
+
+
+def cpu_percent_between(totals, prev_totals, cpu_scale):
+    """CPU percent between two cpu_totals() readings; None if there is no usable delta."""
+    if totals is None or prev_totals is None:
+        return None
+    
+    cpu_delta = totals[0] - prev_totals[0]
+    system_delta = totals[1] - prev_totals[1]
+    if system_delta <= 0 or cpu_delta < 0:
+        return None
+    return cpu_delta * cpu_scale / system_delta
+
+
+def cpu_percent_from_stats(stats, cpu_scale):
+    """
+    Compute CPU usage percent from one Docker stats frame.
+    Returns None when the frame has no usable delta yet.
+    """
+    return cpu_percent_between(
+        cpu_totals(stats.get("cpu_stats")),
+        cpu_totals(stats.get("precpu_stats")),
+        cpu_scale
+    )
+
+
+def get_docker_client():
+    """Return the shared Docker client, connecting on first call."""
+    global docker_client
+    
+    if docker_client is None:
+        with docker_client_lock:
+            if docker_client is None:
+                docker_client = docker.from_env(max_pool_size=DOCKER_POOL_SIZE)
+    return docker_client
+
+
+def ensure_image(client, image_name):
+    """Make sure an image is available locally, pulling it if needed."""
+    if image_name in known_images:
+        return
+    
+    try:
+        client.images.get(image_name)
+    except docker.errors.ImageNotFound:
+        client.images.pull(image_name)
+    
+    with known_images_lock:
+        known_images.add(image_name)
+
+
+def remember_local_images(client):
+    """Seed known_images with every local tag from a single images.list() call."""
+    tags = {tag for image in client.images.list() for tag in image.tags}
+    with known_images_lock:
+        known_images.update(tags)
+
+
+def pull_images(client, image_names):
+    """
+    Pull every image not already known to be local, several at once.
+    Failures are ignored here; the test for that image reports them.
+    """
+    missing = [name for name in image_names if name not in known_images]
+    if not missing:
+        return
+    
+    def pull(image_name):
+        try:
+            ensure_image(client, image_name)
+        except docker.errors.DockerException:
+            pass
+    
+    with ThreadPoolExecutor(max_workers=IMAGE_PULL_WORKERS, thread_name_prefix='image-pull') as pool:
+        list(pool.map(pull, missing))
+
+
+def forget_image(image_name):
+    """Drop an image from the known-present cache (e.g. after a failed run)."""
+    with known_images_lock:
+        known_images.discard(image_name)
+
+
+def remove_container(api, container_id):
+    """
+    Kill and remove a container, with its anonymous volumes, in one API call.
+    The samples are already taken, so there is no point in stop()'s 10 s grace period.
+    """
+    try:
+        api.remove_container(container_id, force=True, v=True)
+    except docker.errors.NotFound:
+        pass
+
+
+def watch_container_exit(container, changed=None):
+    """
+    Return an Event that is set as soon as the container exits. When given, the
+    `changed` Condition is notified too, so its waiters see the exit right away.
+    """
+    exited = threading.Event()
+    
+    def wait_for_exit():
+        try:
+            container.wait()
+        except Exception:
+            pass
+        exited.set()
+        if changed is not None:
+            with changed:
+                changed.notify_all()
+    
+    threading.Thread(target=wait_for_exit, daemon=True).start()
+    return exited
+
+
+def record_live_sample(container_info, cpu_percent, mem_usage):
+    """Fold one sample into container_info and wake its stream; cpu_percent may be None."""
+    container_info['phase'] = 'running'
+    if cpu_percent is not None:
+        container_info['cpu_current'] = cpu_percent
+        container_info['cpu_summary'] = add_sample(container_info['cpu_summary'], cpu_percent)
+    container_info['mem_current'] = mem_usage
+    container_info['mem_summary'] = add_sample(container_info['mem_summary'], mem_usage)
+    container_info['samples'] += 1
+    with container_info['changed']:
+        container_info['changed'].notify_all()
+
+
+def follow_live_stats(container_info, api, container_id):
+    """
+    Sample a live-test container once a second on a daemon thread and fold every
+    sample into container_info, so /api/live-test-stats only reads memory.
+    On the Docker host this reads the container's cgroup files; otherwise it
+    keeps one dockerd stats stream open, which ends when the container stops.
+    """
+    cgroup_paths = find_cgroup_paths(container_id)
+    
+    def read_cgroup():
+        # No deadline: a live test runs until the container exits or is stopped
+        try:
+            for cpu_percent, mem_usage in cgroup_samples(cgroup_paths, float('inf'), container_info['exited']):
+                record_live_sample(container_info, cpu_percent, mem_usage)
+        except (OSError, ValueError):
+            # dockerd removes the cgroup once the container stops
+            pass
+    
+    def read_stream():
+        try:
+            for stats_raw in api.stats(container_id, stream=True):
+                stats = json_loads(stats_raw)
+                
+                # dockerd sends a zeroed frame once the container has exited
+                memory_stats = stats.get("memory_stats")
+                if not memory_stats:
+                    return
+                
+                if container_info['cpu_scale'] is None:
+                    container_info['cpu_scale'] = cpu_scale_from_stats(stats)
+                
+                # The first frame's precpu_stats is empty, so it has no CPU delta
+                cpu_percent = cpu_percent_from_stats(stats, container_info['cpu_scale'])
+                
+                record_live_sample(container_info, cpu_percent, memory_stats.get("usage", 0) / (1024 ** 2))
+        except Exception:
+            pass
+    
+    threading.Thread(target=read_cgroup if cgroup_paths else read_stream, daemon=True).start()
+
+
+def follow_live_logs(container_info, container):
+    """
+    Follow a live-test container's output on a daemon thread. container_info['log']
+    is a deque of recent text chunks holding at least the last LIVE_LOG_LIMIT
+    characters ('log_kept' of them), and 'log_total' counts every character seen,
+    so clients ask for what they haven't seen by offset. All three change together
+    under the 'changed' Condition.
+    """
+    def read_logs():
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        try:
+            for chunk in container.logs(stream=True, follow=True):
+                text = decoder.decode(chunk)
+                if not text:
+                    continue
+                
+                with container_info['changed']:
+                    # Append and drop whole chunks from the left instead of
+                    # copying the kept text for every chunk
+                    chunks = container_info['log']
+                    container_info['log_total'] += len(text)
+                    text = text[-LIVE_LOG_LIMIT:]
+                    chunks.append(text)
+                    kept = container_info['log_kept'] + len(text)
+                    while kept - len(chunks[0]) >= LIVE_LOG_LIMIT:
+                        kept -= len(chunks.popleft())
+                    container_info['log_kept'] = kept
+                    container_info['changed'].notify_all()
+        except Exception:
+            pass
+    
+    threading.Thread(target=read_logs, daemon=True).start()
+
+
+def log_delta(container_info, offset):
+    """Return (text after offset, total length); offsets older than the kept text get all of it."""
+    with container_info['changed']:
+        total = container_info['log_total']
+        missing = total - offset
+        if missing <= 0:
+            return '', total
+        
+        # Join only the newest chunks that cover the missing text
+        parts = []
+        length = 0
+        for chunk in reversed(container_info['log']):
+            parts.append(chunk)
+            length += len(chunk)
+            if length >= missing:
+                break
+    text = ''.join(reversed(parts))
+    return text[-missing:], total
+
+
+def live_stats_payload(container_info, log_offset):
+    """The live-test stats for one container, with the output after log_offset."""
+    cpu_summary = container_info['cpu_summary']
+    mem_summary = container_info['mem_summary']
+    logs, log_total = log_delta(container_info, log_offset)
+    
+    return {
+        'status': 'success',
+        'phase': container_info['phase'],
+        'cpu_current': container_info['cpu_current'],
+        'cpu_avg': summary_mean(cpu_summary),
+        'cpu_peak': cpu_summary[2],
+        'mem_current': container_info['mem_current'],
+        'mem_avg': summary_mean(mem_summary),
+        'mem_peak': mem_summary[2],
+        'samples': container_info['samples'],
+        'runtime': time.time() - container_info['start_time'],
+        'log_delta': logs,
+        'log_total_len': log_total
+    }
+
+
+def event_data(payload):
+    """Encode a payload as one Server-Sent Events data line."""
+    data = orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode('utf-8')
+    return b'data: ' + data + b'\n\n'
+
+
+def live_events(container_info, log_offset=0):
+    """
+    Server-Sent Events for a live-test container: one event per new sample or
+    output, until the container exits. Each event's id is the log offset, so a
+    reconnecting EventSource resumes the output where it left off.
+    """
+    changed = container_info['changed']
+    exited = container_info['exited']
+    last_version = None
+    
+    def version():
+        return container_info['samples'], container_info['log_total']
+    
+    while True:
+        with changed:
+            changed.wait_for(lambda: exited.is_set() or version() != last_version,
+                             timeout=PROGRESS_KEEPALIVE)
+        
+        if exited.is_set():
+            yield event_data({'status': 'error', 'error': 'Container is not running'})
+            return
+        
+        if version() == last_version:
+            yield b': keep-alive\n\n'
+            continue
+        last_version = version()
+        
+        payload = live_stats_payload(container_info, log_offset)
+        log_offset = payload['log_total_len']
+        yield f'id: {log_offset}\n'.encode('ascii') + event_data(payload)
+
+
+def summarize_samples(samples):
+    """
+    Reduce (cpu_percent, mem_mb) samples to (cpu_avg, cpu_peak, mem_avg, mem_peak, count)
+    in one pass as they arrive, keeping no per-sample history.
+    cpu_percent may be None for samples without a CPU delta. Returns None when
+    no usable CPU sample was collected.
+    """
+    cpu_summary = (0, 0.0, 0.0)  # (count, total, peak)
+    mem_summary = (0, 0.0, 0.0)
+    
+    for cpu_percent, mem_usage in samples:
+        if cpu_percent is not None:
+            cpu_summary = add_sample(cpu_summary, cpu_percent)
+        mem_summary = add_sample(mem_summary, mem_usage)
+    
+    if not cpu_summary[0] or not mem_summary[0]:
+        return None
+    return summary_mean(cpu_summary), cpu_summary[2], summary_mean(mem_summary), mem_summary[2], mem_summary[0]
+
+
+def estimate_single_image(image_name, test_duration=20, custom_command=None,
+                          environment=None, keep_alive=True):
     """
     Estimate resources for a single Docker image.
+    Without a custom command the container runs KEEP_ALIVE_COMMAND, or the
+    image's own CMD when keep_alive is False.
     Returns dict with results or error.
     """
     try:
-        client = docker.from_env()
+        client = get_docker_client()
         
         # Check/pull image
         try:
-            image = client.images.get(image_name)
-        except docker.errors.ImageNotFound:
-            try:
-                image = client.images.pull(image_name)
-            except docker.errors.APIError as e:
-                return {"error": f"Failed to pull image: {str(e)}"}
+            ensure_image(client, image_name)
+        except docker.errors.APIError as e:
+            return {"error": f"Failed to pull image: {str(e)}"}
         
         # Start container
         container = None
         try:
-            cmd = custom_command if custom_command else "tail -f /dev/null"
-            container = client.containers.run(image_name, detach=True, command=cmd)
+            cmd = custom_command or (KEEP_ALIVE_COMMAND if keep_alive else None)
+            container = client.containers.run(image_name, detach=True, command=cmd,
+                                              environment=environment)
         except docker.errors.APIError as e:
-            # Try fallback commands
-            if "executable file not found" in str(e) and not custom_command:
+            forget_image(image_name)
+            # The image has no CMD of its own; keep it alive instead
+            if "no command specified" in str(e) and not cmd:
                 try:
-                    container = client.containers.run(image_name, detach=True, command="sleep infinity")
+                    container = client.containers.run(image_name, detach=True, command=KEEP_ALIVE_COMMAND,
+                                                      environment=environment)
+                except Exception as final_e:
+                    return {"error": f"Failed to start container: {str(final_e)}"}
+            # The image has no tail; try other ways of idling
+            elif "executable file not found" in str(e) and cmd == KEEP_ALIVE_COMMAND:
+                try:
+                    container = client.containers.run(image_name, detach=True, command="sleep infinity",
+                                                      environment=environment)
                 except:
                     try:
-                        container = client.containers.run(image_name, detach=True)
+                        container = client.containers.run(image_name, detach=True, environment=environment)
                     except Exception as final_e:
                         return {"error": f"Failed to start container: {str(final_e)}"}
             else:
                 return {"error": f"Failed to start container: {str(e)}"}
         
-        # Collect stats
-        cpu_usages = []
-        mem_usages = []
-        
         try:
-            stats_stream = container.stats(stream=True)
-            start = time.time()
-            sample_count = 0
+            # Read the cgroup files directly when dockerd shares our kernel,
+            # otherwise fall back to the Docker stats API
+            # Monotonic, so a clock step (NTP) can't stretch or cut the test
+            deadline = time.monotonic() + test_duration
+            exited = watch_container_exit(container)
+            cgroup_paths = find_cgroup_paths(container.id)
+            if cgroup_paths:
+                samples = cgroup_samples(cgroup_paths, deadline, exited)
+            else:
+                samples = docker_api_samples(client.api, container.id, deadline, exited)
             
-            while time.time() - start < test_duration:
-                try:
-                    # Check if container is still running
-                    container.reload()
-                    if container.status != 'running':
-                        break
-                    
-                    stats_raw = next(stats_stream)
-                    
-                    # Decode stats if bytes
-                    if isinstance(stats_raw, bytes):
-                        stats = json.loads(stats_raw.decode('utf-8'))
-                    else:
-                        stats = stats_raw
-                    
-                    # CPU calculation
-                    cpu_stats = stats.get("cpu_stats", {})
-                    precpu_stats = stats.get("precpu_stats", {})
-                    
-                    cpu_total = cpu_stats.get("cpu_usage", {}).get("total_usage", 0)
-                    precpu_total = precpu_stats.get("cpu_usage", {}).get("total_usage", 0)
-                    
-                    system_cpu = cpu_stats.get("system_cpu_usage", 0)
-                    presystem_cpu = precpu_stats.get("system_cpu_usage", 0)
-                    
-                    cpu_delta = cpu_total - precpu_total
-                    system_delta = system_cpu - presystem_cpu
-                    
-                    online_cpus = cpu_stats.get("online_cpus")
-                    if not online_cpus:
-                        percpu_usage = cpu_stats.get("cpu_usage", {}).get("percpu_usage", [])
-                        online_cpus = len(percpu_usage) if percpu_usage else 1
-                    
-                    if system_delta > 0 and cpu_delta >= 0:
-                        cpu_percent = (cpu_delta / system_delta) * online_cpus * 100.0
-                        cpu_usages.append(cpu_percent)
-                    
-                    # Memory
-                    mem_usage = stats.get("memory_stats", {}).get("usage", 0) / (1024 ** 2)
-                    mem_usages.append(mem_usage)
-                    
-                    sample_count += 1
-                    time.sleep(1)
-                    
-                except (StopIteration, KeyError):
-                    break
+            summary = summarize_samples(samples)
                     
         finally:
             if container:
                 try:
-                    container.stop()
-                    container.remove()
+                    remove_container(client.api, container.id)
                 except:
                     pass
         
         # Calculate results
-        if not cpu_usages or not mem_usages:
+        if summary is None:
             return {"error": "No stats collected. Container may have exited too early."}
         
-        avg_cpu = statistics.mean(cpu_usages)
-        peak_cpu = max(cpu_usages)
-        avg_mem = statistics.mean(mem_usages)
-        peak_mem = max(mem_usages)
+        avg_cpu, peak_cpu, avg_mem, peak_mem, sample_count = summary
         
         recommended_vcpu = max(1, round(peak_cpu / 80))
         recommended_ram = round(peak_mem * 1.5 / 1024, 2)
@@ -188,61 +679,178 @@ def estimate_single_image(image_name, test_duration=20, custom_command=None):
         return {"error": str(e)}
 
 
-def get_instance_recommendations(vcpu, ram_gb):
-    """Get cloud instance recommendations based on vCPU and RAM."""
-    if vcpu == 1 and ram_gb <= 1:
-        return {
-            "aws": "t3.micro",
-            "gcp": "e2-micro",
-            "azure": "B1s"
-        }
-    elif vcpu == 1 and ram_gb <= 2:
-        return {
-            "aws": "t3.small",
-            "gcp": "e2-small",
-            "azure": "B1ms"
-        }
-    elif vcpu == 2:
-        return {
-            "aws": "t3.medium",
-            "gcp": "e2-medium",
-            "azure": "B2s"
-        }
-    else:
-        return {
-            "aws": "t3.large+",
-            "gcp": "e2-standard+",
-            "azure": "B2ms+"
-        }
+def publish_progress():
+    """
+    Bump the revision and republish progress_view after a change to test_progress.
+    Call with progress_lock held.
+    """
+    global progress_view
+    
+    test_progress['revision'] += 1
+    progress_view = (
+        test_progress['status'],
+        test_progress['phase'],
+        test_progress['current'],
+        test_progress['total'],
+        test_progress['successful'],
+        test_progress['current_image'],
+        f"{test_progress['job_id']}-{test_progress['revision']}"
+    )
+    progress_changed.notify_all()
+
+
+def progress_payload(view):
+    """The JSON body for a progress_view tuple."""
+    status, phase, current, total, successful, current_image, version = view
+    return {
+        'status': status,
+        'phase': phase,
+        'current': current,
+        'total': total,
+        'successful': successful,
+        'current_image': current_image,
+        'version': version
+    }
+
+
+def progress_events():
+    """
+    Server-Sent Events for the bulk progress: one event now, then one per change
+    until the run is complete. Idle gaps get a keep-alive comment.
+    """
+    last_version = None
+    while True:
+        with progress_changed:
+            progress_changed.wait_for(lambda: progress_view[-1] != last_version,
+                                      timeout=PROGRESS_KEEPALIVE)
+            view = progress_view
+        
+        if view[-1] == last_version:
+            yield b': keep-alive\n\n'
+            continue
+        last_version = view[-1]
+        
+        yield event_data(progress_payload(view))
+        
+        if view[0] == 'complete':
+            return
+
 
+def progress_snapshot():
+    """Return (status, phase, current, total, successful, current_image, version) without locking."""
+    # Rebinding a global is atomic, so this is always one complete snapshot
+    return progress_view
 
-def run_bulk_tests(duration=20):
-    """Run tests on all default images."""
+
+def group_by_category(results):
+    """Group the successful results by category, in the order categories first appear."""
+    by_category = {}
+    for result in results:
+        if 'error' not in result:
+            by_category.setdefault(result.get('category', 'Other'), []).append(result)
+    return by_category
+
+
+def run_bulk_tests(duration=20, workers=BULK_TEST_WORKERS):
+    """Run tests on all default images, `workers` containers at a time."""
     global test_progress
     
-    test_progress['status'] = 'running'
-    test_progress['total'] = len(DEFAULT_TEST_IMAGES)
-    test_progress['current'] = 0
-    test_progress['results'] = []
+    with progress_lock:
+        test_progress['status'] = 'running'
+        test_progress['total'] = len(DEFAULT_TEST_IMAGES)
+        test_progress['current'] = 0
+        test_progress['current_image'] = ''
+        test_progress['phase'] = 'pulling'
+        # Bounded to one run's worth so results never accumulate across runs
+        test_progress['results'] = deque(maxlen=len(DEFAULT_TEST_IMAGES))
+        test_progress['by_category'] = {}
+        test_progress['successful'] = 0
+        publish_progress()
+        bulk_results_cache.clear()
     
-    for idx, image_config in enumerate(DEFAULT_TEST_IMAGES, 1):
-        test_progress['current'] = idx
-        test_progress['current_image'] = image_config['name']
-        
-        result = estimate_single_image(
-            image_config['name'],
-            duration,
-            image_config.get('command')
-        )
-        
-        if 'error' not in result:
-            result['description'] = image_config['description']
-            result['category'] = image_config['category']
+    # One images.list() up front instead of an images.get() per test, then
+    # pull whatever is missing in parallel so pulls stay out of the timed part
+    try:
+        client = get_docker_client()
+        remember_local_images(client)
+        pull_images(client, [image_config.name for image_config in DEFAULT_TEST_IMAGES])
+    except docker.errors.DockerException:
+        pass
+    
+    with progress_lock:
+        test_progress['phase'] = 'measuring'
+        publish_progress()
+    
+    in_flight = []
+    
+    def run_one(image_config):
+        with progress_lock:
+            in_flight.append(image_config.name)
+            test_progress['current_image'] = ', '.join(in_flight)
+            publish_progress()
+        try:
+            return estimate_single_image(
+                image_config.name,
+                duration,
+                image_config.command,
+                environment=dict(image_config.environment) or None,
+                keep_alive=False
+            )
+        finally:
+            with progress_lock:
+                in_flight.remove(image_config.name)
+                test_progress['current_image'] = ', '.join(in_flight)
+                publish_progress()
+    
+    ordered_results = [None] * len(DEFAULT_TEST_IMAGES)
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(run_one, image_config): idx
+            for idx, image_config in enumerate(DEFAULT_TEST_IMAGES)
+        }
         
-        test_progress['results'].append(result)
-        time.sleep(1)  # Small delay between tests
+        for future in as_completed(futures):
+            idx = futures[future]
+            image_config = DEFAULT_TEST_IMAGES[idx]
+            result = future.result()
+            
+            if 'error' not in result:
+                result['description'] = image_config.description
+                result['category'] = image_config.category
+            
+            ordered_results[idx] = result
+            # All per-image fields change together under one lock
+            with progress_lock:
+                test_progress['current'] += 1
+                test_progress['results'].append(result)
+                if 'error' not in result:
+                    test_progress['by_category'].setdefault(image_config.category, []).append(result)
+                    test_progress['successful'] += 1
+                publish_progress()
     
-    test_progress['status'] = 'complete'
+    # Report in configuration order rather than completion order
+    with progress_lock:
+        test_progress['results'] = deque(ordered_results, maxlen=len(DEFAULT_TEST_IMAGES))
+        test_progress['by_category'] = group_by_category(ordered_results)
+        test_progress['status'] = 'complete'
+        test_progress['completed_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        publish_progress()
+
+
+def finish_bulk_job(future):
+    """
+    Done-callback for a bulk run. If run_bulk_tests raised, mark the run complete
+    anyway so pollers stop waiting and can show whatever results came in.
+    """
+    if future.exception() is None:
+        return
+    
+    print(f"⚠️  Bulk test run failed: {future.exception()}")
+    with progress_lock:
+        test_progress['status'] = 'complete'
+        test_progress['completed_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        publish_progress()
 
 
 # HTML Templates
@@ -253,131 +861,7 @@ HOME_TEMPLATE = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Docker Resource Estimator</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-        }
-        
-        header {
-            text-align: center;
-            color: white;
-            margin-bottom: 50px;
-        }
-        
-        h1 {
-            font-size: 3em;
-            margin-bottom: 10px;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }
-        
-        .subtitle {
-            font-size: 1.2em;
-            opacity: 0.9;
-        }
-        
-        .cards {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 30px;
-            margin-top: 40px;
-        }
-        
-        .card {
-            background: white;
-            border-radius: 15px;
-            padding: 40px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-            transition: transform 0.3s, box-shadow 0.3s;
-            cursor: pointer;
-        }
-        
-        .card:hover {
-            transform: translateY(-10px);
-            box-shadow: 0 15px 40px rgba(0,0,0,0.4);
-        }
-        
-        .card-icon {
-            font-size: 4em;
-            margin-bottom: 20px;
-            text-align: center;
-        }
-        
-        .card h2 {
-            color: #667eea;
-            margin-bottom: 15px;
-            font-size: 1.8em;
-        }
-        
-        .card p {
-            color: #666;
-            line-height: 1.6;
-            margin-bottom: 20px;
-        }
-        
-        .btn {
-            display: inline-block;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 15px 30px;
-            border-radius: 25px;
-            text-decoration: none;
-            transition: all 0.3s;
-            border: none;
-            cursor: pointer;
-            font-size: 1em;
-            font-weight: bold;
-        }
-        
-        .btn:hover {
-            transform: scale(1.05);
-            box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
-        }
-        
-        .features {
-            background: rgba(255,255,255,0.1);
-            border-radius: 15px;
-            padding: 30px;
-            margin-top: 50px;
-            color: white;
-        }
-        
-        .features h3 {
-            margin-bottom: 20px;
-            font-size: 1.5em;
-        }
-        
-        .features ul {
-            list-style: none;
-        }
-        
-        .features li {
-            padding: 10px 0;
-            padding-left: 30px;
-            position: relative;
-        }
-        
-        .features li:before {
-            content: "✓";
-            position: absolute;
-            left: 0;
-            font-weight: bold;
-            color: #4ade80;
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('home.css') }}">
 </head>
 <body>
     <div class="container">
@@ -434,173 +918,7 @@ BULK_TEST_TEMPLATE = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Bulk Test - Docker Resource Estimator</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }
-        
-        .container {
-            max-width: 1000px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            padding: 40px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-        }
-        
-        h1 {
-            color: #667eea;
-            margin-bottom: 30px;
-            text-align: center;
-        }
-        
-        .config-section {
-            background: #f8f9fa;
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 30px;
-        }
-        
-        .form-group {
-            margin-bottom: 20px;
-        }
-        
-        label {
-            display: block;
-            margin-bottom: 5px;
-            font-weight: bold;
-            color: #333;
-        }
-        
-        input, select {
-            width: 100%;
-            padding: 10px;
-            border: 2px solid #ddd;
-            border-radius: 5px;
-            font-size: 1em;
-        }
-        
-        .btn {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 15px 40px;
-            border-radius: 25px;
-            border: none;
-            cursor: pointer;
-            font-size: 1.1em;
-            font-weight: bold;
-            width: 100%;
-            transition: all 0.3s;
-        }
-        
-        .btn:hover {
-            transform: scale(1.02);
-            box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
-        }
-        
-        .btn:disabled {
-            opacity: 0.6;
-            cursor: not-allowed;
-        }
-        
-        .progress-section {
-            display: none;
-            margin-top: 30px;
-        }
-        
-        .progress-bar {
-            width: 100%;
-            height: 30px;
-            background: #e0e0e0;
-            border-radius: 15px;
-            overflow: hidden;
-            margin-bottom: 20px;
-        }
-        
-        .progress-fill {
-            height: 100%;
-            background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-            transition: width 0.3s;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-weight: bold;
-        }
-        
-        .current-test {
-            text-align: center;
-            padding: 20px;
-            background: #f0f0f0;
-            border-radius: 10px;
-            margin-bottom: 20px;
-        }
-        
-        .spinner {
-            border: 4px solid #f3f3f3;
-            border-top: 4px solid #667eea;
-            border-radius: 50%;
-            width: 40px;
-            height: 40px;
-            animation: spin 1s linear infinite;
-            margin: 20px auto;
-        }
-        
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-        
-        .back-btn {
-            display: inline-block;
-            margin-top: 20px;
-            color: #667eea;
-            text-decoration: none;
-            font-weight: bold;
-        }
-        
-        .back-btn:hover {
-            text-decoration: underline;
-        }
-        
-        .image-list {
-            background: #f8f9fa;
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-        }
-        
-        .image-list h3 {
-            margin-bottom: 15px;
-            color: #667eea;
-        }
-        
-        .image-list ul {
-            list-style: none;
-            columns: 2;
-        }
-        
-        .image-list li {
-            padding: 5px 0;
-            padding-left: 20px;
-            position: relative;
-        }
-        
-        .image-list li:before {
-            content: "🐳";
-            position: absolute;
-            left: 0;
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('bulk_test.css') }}">
 </head>
 <body>
     <div class="container">
@@ -651,48 +969,7 @@ BULK_TEST_TEMPLATE = """
         <a href="/" class="back-btn">← Back to Home</a>
     </div>
     
-    <script>
-        let checkInterval;
-        
-        function startBulkTest() {
-            const duration = document.getElementById('duration').value;
-            const startBtn = document.getElementById('startBtn');
-            const progressSection = document.getElementById('progressSection');
-            
-            // Disable button and show progress
-            startBtn.disabled = true;
-            startBtn.textContent = 'Testing in progress...';
-            progressSection.style.display = 'block';
-            
-            // Start the test
-            fetch('/api/start-bulk-test', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({duration: parseInt(duration)})
-            });
-            
-            // Poll for progress
-            checkInterval = setInterval(checkProgress, 1000);
-        }
-        
-        function checkProgress() {
-            fetch('/api/bulk-test-progress')
-                .then(response => response.json())
-                .then(data => {
-                    const percent = (data.current / data.total) * 100;
-                    document.getElementById('progressFill').style.width = percent + '%';
-                    document.getElementById('progressFill').textContent = Math.round(percent) + '%';
-                    document.getElementById('currentImage').textContent = data.current_image || 'Waiting...';
-                    document.getElementById('currentProgress').textContent = data.current;
-                    document.getElementById('totalImages').textContent = data.total;
-                    
-                    if (data.status === 'complete') {
-                        clearInterval(checkInterval);
-                        window.location.href = '/results?type=bulk';
-                    }
-                });
-        }
-    </script>
+    <script src="{{ asset_url('bulk_test.js') }}"></script>
 </body>
 </html>
 """
@@ -704,144 +981,7 @@ SINGLE_TEST_TEMPLATE = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Single Image Test - Docker Resource Estimator</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }
-        
-        .container {
-            max-width: 800px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            padding: 40px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-        }
-        
-        h1 {
-            color: #667eea;
-            margin-bottom: 30px;
-            text-align: center;
-        }
-        
-        .form-group {
-            margin-bottom: 25px;
-        }
-        
-        label {
-            display: block;
-            margin-bottom: 8px;
-            font-weight: bold;
-            color: #333;
-        }
-        
-        input {
-            width: 100%;
-            padding: 12px;
-            border: 2px solid #ddd;
-            border-radius: 8px;
-            font-size: 1em;
-            transition: border-color 0.3s;
-        }
-        
-        input:focus {
-            outline: none;
-            border-color: #667eea;
-        }
-        
-        small {
-            display: block;
-            margin-top: 5px;
-            color: #666;
-        }
-        
-        .btn {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 15px 40px;
-            border-radius: 25px;
-            border: none;
-            cursor: pointer;
-            font-size: 1.1em;
-            font-weight: bold;
-            width: 100%;
-            transition: all 0.3s;
-            margin-top: 20px;
-        }
-        
-        .btn:hover:not(:disabled) {
-            transform: scale(1.02);
-            box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
-        }
-        
-        .btn:disabled {
-            opacity: 0.6;
-            cursor: not-allowed;
-        }
-        
-        .progress-section {
-            display: none;
-            margin-top: 30px;
-            padding: 30px;
-            background: #f8f9fa;
-            border-radius: 10px;
-            text-align: center;
-        }
-        
-        .spinner {
-            border: 4px solid #f3f3f3;
-            border-top: 4px solid #667eea;
-            border-radius: 50%;
-            width: 50px;
-            height: 50px;
-            animation: spin 1s linear infinite;
-            margin: 20px auto;
-        }
-        
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-        
-        .back-btn {
-            display: inline-block;
-            margin-top: 20px;
-            color: #667eea;
-            text-decoration: none;
-            font-weight: bold;
-        }
-        
-        .back-btn:hover {
-            text-decoration: underline;
-        }
-        
-        .examples {
-            background: #f0f7ff;
-            padding: 15px;
-            border-radius: 8px;
-            margin-top: 15px;
-        }
-        
-        .examples strong {
-            color: #667eea;
-        }
-        
-        .examples code {
-            background: white;
-            padding: 2px 6px;
-            border-radius: 3px;
-            font-family: monospace;
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('single_test.css') }}">
 </head>
 <body>
     <div class="container">
@@ -905,50 +1045,7 @@ SINGLE_TEST_TEMPLATE = """
         <a href="/" class="back-btn">← Back to Home</a>
     </div>
     
-    <script>
-        function startSingleTest(event) {
-            event.preventDefault();
-            
-            const imageName = document.getElementById('imageName').value;
-            const duration = document.getElementById('duration').value;
-            const command = document.getElementById('command').value;
-            const testBtn = document.getElementById('testBtn');
-            const progressSection = document.getElementById('progressSection');
-            
-            // Show progress
-            testBtn.disabled = true;
-            testBtn.textContent = 'Testing...';
-            progressSection.style.display = 'block';
-            
-            // Submit test
-            fetch('/api/start-single-test', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({
-                    image: imageName,
-                    duration: parseInt(duration),
-                    command: command || null
-                })
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.status === 'success') {
-                    window.location.href = '/results?type=single';
-                } else {
-                    alert('Test failed: ' + (data.error || 'Unknown error'));
-                    testBtn.disabled = false;
-                    testBtn.textContent = '🚀 Start Test';
-                    progressSection.style.display = 'none';
-                }
-            })
-            .catch(error => {
-                alert('Error: ' + error);
-                testBtn.disabled = false;
-                testBtn.textContent = '🚀 Start Test';
-                progressSection.style.display = 'none';
-            });
-        }
-    </script>
+    <script src="{{ asset_url('single_test.js') }}"></script>
 </body>
 </html>
 """
@@ -960,252 +1057,7 @@ LIVE_TEST_TEMPLATE = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Live Monitoring - Docker Resource Estimator</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }
-        
-        .container {
-            max-width: 1000px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            padding: 40px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-        }
-        
-        h1 {
-            color: #667eea;
-            margin-bottom: 30px;
-            text-align: center;
-        }
-        
-        .form-section {
-            background: #f8f9fa;
-            padding: 25px;
-            border-radius: 10px;
-            margin-bottom: 30px;
-        }
-        
-        .form-group {
-            margin-bottom: 20px;
-        }
-        
-        label {
-            display: block;
-            margin-bottom: 8px;
-            font-weight: bold;
-            color: #333;
-        }
-        
-        input {
-            width: 100%;
-            padding: 12px;
-            border: 2px solid #ddd;
-            border-radius: 8px;
-            font-size: 1em;
-        }
-        
-        small {
-            display: block;
-            margin-top: 5px;
-            color: #666;
-        }
-        
-        .btn {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 15px 40px;
-            border-radius: 25px;
-            border: none;
-            cursor: pointer;
-            font-size: 1.1em;
-            font-weight: bold;
-            width: 100%;
-            transition: all 0.3s;
-        }
-        
-        .btn:hover:not(:disabled) {
-            transform: scale(1.02);
-            box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
-        }
-        
-        .btn:disabled {
-            opacity: 0.6;
-            cursor: not-allowed;
-        }
-        
-        .btn.danger {
-            background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%);
-        }
-        
-        .stats-section {
-            display: none;
-            margin-top: 30px;
-        }
-        
-        .status-badge {
-            display: inline-block;
-            padding: 8px 20px;
-            border-radius: 20px;
-            font-weight: bold;
-            margin-bottom: 20px;
-        }
-        
-        .status-badge.running {
-            background: #10b981;
-            color: white;
-        }
-        
-        .status-badge.stopped {
-            background: #ef4444;
-            color: white;
-        }
-        
-        .container-info {
-            background: #f8f9fa;
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 30px;
-        }
-        
-        .container-info h3 {
-            color: #667eea;
-            margin-bottom: 10px;
-        }
-        
-        .info-row {
-            display: flex;
-            justify-content: space-between;
-            padding: 8px 0;
-            border-bottom: 1px solid #ddd;
-        }
-        
-        .info-row:last-child {
-            border-bottom: none;
-        }
-        
-        .info-label {
-            font-weight: bold;
-            color: #666;
-        }
-        
-        .info-value {
-            color: #333;
-            font-family: monospace;
-        }
-        
-        .metrics-grid {
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 20px;
-            margin-bottom: 30px;
-        }
-        
-        .metric-card {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 25px;
-            border-radius: 10px;
-            text-align: center;
-        }
-        
-        .metric-label {
-            font-size: 1em;
-            opacity: 0.9;
-            margin-bottom: 10px;
-        }
-        
-        .metric-value {
-            font-size: 2.5em;
-            font-weight: bold;
-            margin-bottom: 5px;
-        }
-        
-        .metric-sub {
-            font-size: 0.9em;
-            opacity: 0.8;
-        }
-        
-        .chart-container {
-            background: #f8f9fa;
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-        }
-        
-        .chart-container h3 {
-            color: #667eea;
-            margin-bottom: 15px;
-        }
-        
-        .chart {
-            height: 200px;
-            background: white;
-            border-radius: 8px;
-            padding: 15px;
-            position: relative;
-            overflow: hidden;
-        }
-        
-        .chart-line {
-            stroke: #667eea;
-            stroke-width: 2;
-            fill: none;
-        }
-        
-        .chart-area {
-            fill: rgba(102, 126, 234, 0.1);
-        }
-        
-        .back-btn {
-            display: inline-block;
-            margin-top: 20px;
-            color: #667eea;
-            text-decoration: none;
-            font-weight: bold;
-        }
-        
-        .back-btn:hover {
-            text-decoration: underline;
-        }
-        
-        .spinner {
-            border: 4px solid #f3f3f3;
-            border-top: 4px solid #667eea;
-            border-radius: 50%;
-            width: 40px;
-            height: 40px;
-            animation: spin 1s linear infinite;
-            margin: 20px auto;
-        }
-        
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-        
-        .history {
-            margin-top: 20px;
-            font-size: 0.9em;
-            color: #666;
-        }
-        
-        .history-item {
-            padding: 5px 0;
-            display: flex;
-            justify-content: space-between;
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('live_test.css') }}">
 </head>
 <body>
     <div class="container">
@@ -1216,14 +1068,9 @@ LIVE_TEST_TEMPLATE = """
                 <label for="presetSelect">Quick Preset (optional):</label>
                 <select id="presetSelect" onchange="loadPreset()" style="width: 100%; padding: 12px; border: 2px solid #ddd; border-radius: 8px; font-size: 1em;">
                     <option value="">-- Select a preset or enter custom --</option>
-                    <option value="mobsf">MobSF - Mobile Security Framework (Port 8000)</option>
-                    <option value="nginx">Nginx Web Server (Port 80)</option>
-                    <option value="apache">Apache Web Server (Port 80)</option>
-                    <option value="redis">Redis Cache (Port 6379)</option>
-                    <option value="postgres">PostgreSQL Database (Port 5432)</option>
-                    <option value="mysql">MySQL Database (Port 3306)</option>
-                    <option value="mongo">MongoDB (Port 27017)</option>
-                    <option value="elasticsearch">Elasticsearch (Port 9200)</option>
+                    {% for key, preset in presets.items() %}
+                    <option value="{{ key }}">{{ preset.label }}</option>
+                    {% endfor %}
                 </select>
                 <small>Select a preset to auto-fill image, command, and port settings</small>
             </div>
@@ -1326,7 +1173,7 @@ LIVE_TEST_TEMPLATE = """
             <div class="chart-container">
                 <h3>CPU Usage Over Time</h3>
                 <div class="chart" id="cpuChart">
-                    <svg width="100%" height="100%" id="cpuSvg"></svg>
+                    <canvas id="cpuCanvas"></canvas>
                 </div>
                 <div class="history" id="cpuHistory"></div>
             </div>
@@ -1334,7 +1181,7 @@ LIVE_TEST_TEMPLATE = """
             <div class="chart-container">
                 <h3>Memory Usage Over Time</h3>
                 <div class="chart" id="memChart">
-                    <svg width="100%" height="100%" id="memSvg"></svg>
+                    <canvas id="memCanvas"></canvas>
                 </div>
                 <div class="history" id="memHistory"></div>
             </div>
@@ -1351,7 +1198,7 @@ LIVE_TEST_TEMPLATE = """
             </div>
             
             <div id="recommendationSection" style="display: none; margin-top: 30px;">
-                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 25px; border-radius: 10px;">
+                <div class="recommendation-panel">
                     <h3 style="margin-bottom: 20px; font-size: 1.5em;">☁️ Recommended Cloud Instance</h3>
                     
                     <div style="background: rgba(255,255,255,0.1); padding: 20px; border-radius: 8px; margin-bottom: 20px;">
@@ -1395,566 +1242,83 @@ LIVE_TEST_TEMPLATE = """
                                 <div style="font-size: 0.9em; opacity: 0.9; margin-bottom: 5px;">AWS</div>
                                 <div style="font-size: 1.2em; font-weight: bold;" id="recAws">-</div>
                             </div>
-                            <div style="background: rgba(255,255,255,0.2); padding: 15px; border-radius: 8px; text-align: center;">
-                                <div style="font-size: 0.9em; opacity: 0.9; margin-bottom: 5px;">Google Cloud</div>
-                                <div style="font-size: 1.2em; font-weight: bold;" id="recGcp">-</div>
-                            </div>
-                            <div style="background: rgba(255,255,255,0.2); padding: 15px; border-radius: 8px; text-align: center;">
-                                <div style="font-size: 0.9em; opacity: 0.9; margin-bottom: 5px;">Azure</div>
-                                <div style="font-size: 1.2em; font-weight: bold;" id="recAzure">-</div>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            
-            <button class="btn danger" id="stopBtn" onclick="stopLiveTest()">⏹️ Stop Container</button>
-        </div>
-        
-        <a href="/" class="back-btn">← Back to Home</a>
-    </div>
-    
-    <script>
-        let pollInterval;
-        let containerId;
-        let startTime;
-        let cpuData = [];
-        let memData = [];
-        let maxDataPoints = 60;
-        let autoScroll = true;
-        let lastLogLength = 0;
-        
-        const presets = {
-            mobsf: {
-                image: 'opensecurity/mobile-security-framework-mobsf:latest',
-                command: '',
-                port: '8000:8000',
-                info: 'MobSF (Mobile Security Framework) - An automated, all-in-one mobile application security assessment framework. Access at http://localhost:8000 with credentials mobsf/mobsf. Perfect for stress testing mobile app analysis workloads.'
-            },
-            nginx: {
-                image: 'nginx:latest',
-                command: "nginx -g 'daemon off;'",
-                port: '80:80',
-                info: 'Nginx - High-performance web server and reverse proxy. Access at http://localhost:80. Great for testing web serving performance.'
-            },
-            apache: {
-                image: 'httpd:latest',
-                command: 'httpd-foreground',
-                port: '80:80',
-                info: 'Apache HTTP Server - Popular open-source web server. Access at http://localhost:80.'
-            },
-            redis: {
-                image: 'redis:latest',
-                command: 'redis-server',
-                port: '6379:6379',
-                info: 'Redis - In-memory data structure store used as cache and message broker. Connect at localhost:6379.'
-            },
-            postgres: {
-                image: 'postgres:latest',
-                command: '',
-                port: '5432:5432',
-                info: 'PostgreSQL - Advanced open-source relational database. Connect at localhost:5432. Note: Set POSTGRES_PASSWORD env var for production.'
-            },
-            mysql: {
-                image: 'mysql:latest',
-                command: '',
-                port: '3306:3306',
-                info: 'MySQL - Popular open-source relational database. Connect at localhost:3306. Note: Set MYSQL_ROOT_PASSWORD env var for production.'
-            },
-            mongo: {
-                image: 'mongo:latest',
-                command: '',
-                port: '27017:27017',
-                info: 'MongoDB - NoSQL document database. Connect at localhost:27017.'
-            },
-            elasticsearch: {
-                image: 'elasticsearch:8.11.0',
-                command: '',
-                port: '9200:9200',
-                info: 'Elasticsearch - Distributed search and analytics engine. Access at http://localhost:9200.'
-            }
-        };
-        
-        function loadPreset() {
-            const select = document.getElementById('presetSelect');
-            const presetKey = select.value;
-            
-            if (!presetKey) {
-                document.getElementById('presetInfo').style.display = 'none';
-                return;
-            }
-            
-            const preset = presets[presetKey];
-            document.getElementById('imageName').value = preset.image;
-            document.getElementById('command').value = preset.command;
-            document.getElementById('portMapping').value = preset.port;
-            document.getElementById('presetInfoText').textContent = preset.info;
-            document.getElementById('presetInfo').style.display = 'block';
-        }
-        
-        function startLiveTest() {
-            const imageName = document.getElementById('imageName').value;
-            const command = document.getElementById('command').value;
-            const portMapping = document.getElementById('portMapping').value;
-            const startBtn = document.getElementById('startBtn');
-            const formSection = document.getElementById('formSection');
-            const statsSection = document.getElementById('statsSection');
-            
-            if (!imageName) {
-                alert('Please enter an image name');
-                return;
-            }
-            
-            startBtn.disabled = true;
-            startBtn.innerHTML = '<div class="spinner" style="width: 20px; height: 20px; border-width: 3px; margin: 0 auto;"></div>';
-            
-            fetch('/api/start-live-test', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({
-                    image: imageName,
-                    command: command || null,
-                    port_mapping: portMapping || null
-                })
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.status === 'success') {
-                    containerId = data.container_id;
-                    startTime = Date.now();
-                    cpuData = [];
-                    memData = [];
-                    lastLogLength = 0;
-                    
-                    document.getElementById('infoImage').textContent = imageName;
-                    document.getElementById('infoContainerId').textContent = containerId.substring(0, 12);
-                    
-                    // Show port mapping and access URL if available
-                    if (data.port_info) {
-                        document.getElementById('infoImage').textContent = imageName + ' ' + data.port_info;
-                        
-                        // Extract port and create clickable link
-                        const portMatch = portMapping.match(/^(\d+):/);
-                        if (portMatch) {
-                            const port = portMatch[1];
-                            const url = `http://localhost:${port}`;
-                            document.getElementById('accessUrl').href = url;
-                            document.getElementById('accessUrl').textContent = url;
-                            document.getElementById('accessUrlRow').style.display = 'flex';
-                        }
-                    }
-                    
-                    formSection.style.display = 'none';
-                    statsSection.style.display = 'block';
-                    
-                    pollInterval = setInterval(pollStats, 1000);
-                } else {
-                    alert('Failed to start container: ' + (data.error || 'Unknown error'));
-                    startBtn.disabled = false;
-                    startBtn.textContent = '🚀 Start Container';
-                }
-            })
-            .catch(error => {
-                alert('Error: ' + error);
-                startBtn.disabled = false;
-                startBtn.textContent = '🚀 Start Container';
-            });
-        }
-        
-        function pollStats() {
-            if (!containerId) return;
-            
-            fetch('/api/live-test-stats?container_id=' + containerId)
-                .then(response => response.json())
-                .then(data => {
-                    if (data.status === 'error') {
-                        clearInterval(pollInterval);
-                        document.getElementById('statusBadge').className = 'status-badge stopped';
-                        document.getElementById('statusBadge').textContent = '● Stopped';
-                        alert('Container stopped: ' + data.error);
-                        return;
-                    }
-                    
-                    // Update runtime
-                    const runtime = Math.floor((Date.now() - startTime) / 1000);
-                    document.getElementById('infoRuntime').textContent = runtime + 's';
-                    document.getElementById('infoSamples').textContent = data.samples;
-                    
-                    // Update CPU
-                    document.getElementById('cpuCurrent').textContent = data.cpu_current.toFixed(2) + '%';
-                    document.getElementById('cpuPeak').textContent = data.cpu_peak.toFixed(2) + '%';
-                    document.getElementById('cpuAvg').textContent = data.cpu_avg.toFixed(2) + '%';
-                    
-                    // Update Memory
-                    document.getElementById('memCurrent').textContent = data.mem_current.toFixed(2) + ' MB';
-                    document.getElementById('memPeak').textContent = data.mem_peak.toFixed(2) + ' MB';
-                    document.getElementById('memAvg').textContent = data.mem_avg.toFixed(2) + ' MB';
-                    
-                    // Store data
-                    cpuData.push(data.cpu_current);
-                    memData.push(data.mem_current);
-                    
-                    if (cpuData.length > maxDataPoints) {
-                        cpuData.shift();
-                        memData.shift();
-                    }
-                    
-                    // Update charts
-                    updateChart('cpuSvg', cpuData, 100, '#667eea');
-                    updateChart('memSvg', memData, Math.max(...memData) * 1.2, '#764ba2');
-                    
-                    // Update history
-                    updateHistory('cpuHistory', cpuData.slice(-5), '%');
-                    updateHistory('memHistory', memData.slice(-5), ' MB');
-                    
-                    // Update terminal output
-                    if (data.logs && data.logs.length > lastLogLength) {
-                        const terminalOutput = document.getElementById('terminalOutput');
-                        if (lastLogLength === 0) {
-                            terminalOutput.innerHTML = '';
-                        }
-                        terminalOutput.textContent = data.logs;
-                        lastLogLength = data.logs.length;
-                        
-                        if (autoScroll) {
-                            terminalOutput.scrollTop = terminalOutput.scrollHeight;
-                        }
-                    }
-                });
-        }
-        
-        function clearTerminal() {
-            document.getElementById('terminalOutput').innerHTML = '<span style="color: #888;">Terminal cleared. New output will appear here...</span>';
-            lastLogLength = 0;
-        }
-        
-        function toggleAutoScroll() {
-            autoScroll = !autoScroll;
-            const btn = document.getElementById('autoScrollBtn');
-            btn.textContent = 'Auto-scroll: ' + (autoScroll ? 'ON' : 'OFF');
-            btn.style.background = autoScroll ? '#667eea' : '#666';
-        }
-        
-        function updateChart(svgId, data, maxVal, color) {
-            const svg = document.getElementById(svgId);
-            const width = svg.clientWidth;
-            const height = svg.clientHeight;
-            
-            if (data.length < 2) return;
-            
-            const xStep = width / (maxDataPoints - 1);
-            const yScale = height / maxVal;
-            
-            let pathData = 'M 0 ' + (height - data[0] * yScale);
-            for (let i = 1; i < data.length; i++) {
-                const x = i * xStep;
-                const y = height - data[i] * yScale;
-                pathData += ' L ' + x + ' ' + y;
-            }
-            
-            let areaData = pathData + ' L ' + ((data.length - 1) * xStep) + ' ' + height + ' L 0 ' + height + ' Z';
+                            <div style="background: rgba(255,255,255,0.2); padding: 15px; border-radius: 8px; text-align: center;">
+                                <div style="font-size: 0.9em; opacity: 0.9; margin-bottom: 5px;">Google Cloud</div>
+                                <div style="font-size: 1.2em; font-weight: bold;" id="recGcp">-</div>
+                            </div>
+                            <div style="background: rgba(255,255,255,0.2); padding: 15px; border-radius: 8px; text-align: center;">
+                                <div style="font-size: 0.9em; opacity: 0.9; margin-bottom: 5px;">Azure</div>
+                                <div style="font-size: 1.2em; font-weight: bold;" id="recAzure">-</div>
+                            </div>
+                        </div>
+                    </div>
+                </div>
+            </div>
             
-            svg.innerHTML = `
-                <path d="${areaData}" fill="${color}" opacity="0.2"/>
-                <path d="${pathData}" stroke="${color}" stroke-width="2" fill="none"/>
-            `;
-        }
-        
-        function updateHistory(elementId, data, unit) {
-            const element = document.getElementById(elementId);
-            const reversed = data.slice().reverse();
-            element.innerHTML = reversed.map((val, idx) => 
-                `<div class="history-item">
-                    <span>${reversed.length - idx} sample(s) ago:</span>
-                    <span><strong>${val.toFixed(2)}${unit}</strong></span>
-                </div>`
-            ).join('');
-        }
+            <button class="btn danger" id="stopBtn" onclick="stopLiveTest()">⏹️ Stop Container</button>
+        </div>
         
-        function stopLiveTest() {
-            if (!containerId) return;
-            
-            if (!confirm('Are you sure you want to stop the container?')) {
-                return;
-            }
-            
-            clearInterval(pollInterval);
-            
-            fetch('/api/stop-live-test', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({container_id: containerId})
-            })
-            .then(response => response.json())
-            .then(data => {
-                document.getElementById('statusBadge').className = 'status-badge stopped';
-                document.getElementById('statusBadge').textContent = '● Stopped';
-                document.getElementById('stopBtn').disabled = true;
-                
-                // Display recommendations if available
-                if (data.recommendations) {
-                    const rec = data.recommendations;
-                    const stats = rec.stats;
-                    
-                    document.getElementById('recVcpu').textContent = rec.vcpu;
-                    document.getElementById('recRam').textContent = rec.ram_gb;
-                    document.getElementById('recCpuPeak').textContent = stats.cpu_peak + '%';
-                    document.getElementById('recMemPeak').textContent = stats.mem_peak_mb.toFixed(2) + ' MB';
-                    document.getElementById('recCpuAvg').textContent = stats.cpu_avg + '%';
-                    document.getElementById('recMemAvg').textContent = stats.mem_avg_mb.toFixed(2) + ' MB';
-                    document.getElementById('recSamples').textContent = stats.samples;
-                    document.getElementById('recDuration').textContent = stats.duration_sec;
-                    document.getElementById('recAws').textContent = rec.instances.aws;
-                    document.getElementById('recGcp').textContent = rec.instances.gcp;
-                    document.getElementById('recAzure').textContent = rec.instances.azure;
-                    
-                    document.getElementById('recommendationSection').style.display = 'block';
-                    
-                    // Scroll to recommendations
-                    document.getElementById('recommendationSection').scrollIntoView({ behavior: 'smooth', block: 'nearest' });
-                }
-                
-                alert('Container stopped successfully! See recommendations below.');
-            })
-            .catch(error => {
-                alert('Error stopping container: ' + error);
-            });
-        }
-    </script>
+        <a href="/" class="back-btn">← Back to Home</a>
+    </div>
+    
+    <script id="presets" type="application/json">{{ presets|tojson }}</script>
+    <script src="{{ asset_url('live_test.js') }}"></script>
 </body>
 </html>
 """
 
-RESULTS_TEMPLATE = """
+RESULTS_BASE_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Test Results - Docker Resource Estimator</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }
-        
-        .container {
-            max-width: 1400px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            padding: 40px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-        }
-        
-        h1 {
-            color: #667eea;
-            margin-bottom: 10px;
-            text-align: center;
-        }
-        
-        .summary {
-            text-align: center;
-            margin-bottom: 30px;
-            color: #666;
-        }
-        
-        .result-card {
-            background: #f8f9fa;
-            border-radius: 10px;
-            padding: 25px;
-            margin-bottom: 20px;
-            border-left: 5px solid #667eea;
-        }
-        
-        .result-card.error {
-            border-left-color: #ef4444;
-            background: #fee;
-        }
-        
-        .result-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 15px;
-        }
-        
-        .result-header h2 {
-            color: #667eea;
-            font-size: 1.4em;
-        }
-        
-        .badge {
-            padding: 5px 15px;
-            border-radius: 20px;
-            font-size: 0.9em;
-            font-weight: bold;
-        }
-        
-        .badge.success {
-            background: #10b981;
-            color: white;
-        }
-        
-        .badge.error {
-            background: #ef4444;
-            color: white;
-        }
-        
-        .metrics {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 15px;
-            margin-bottom: 20px;
-        }
-        
-        .metric {
-            background: white;
-            padding: 15px;
-            border-radius: 8px;
-            text-align: center;
-        }
-        
-        .metric-label {
-            font-size: 0.9em;
-            color: #666;
-            margin-bottom: 5px;
-        }
-        
-        .metric-value {
-            font-size: 1.5em;
-            font-weight: bold;
-            color: #333;
-        }
-        
-        .recommendation {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 10px;
-            margin-top: 15px;
-        }
-        
-        .recommendation h3 {
-            margin-bottom: 15px;
-        }
-        
-        .instances {
-            display: grid;
-            grid-template-columns: repeat(3, 1fr);
-            gap: 15px;
-        }
-        
-        .instance {
-            background: rgba(255,255,255,0.2);
-            padding: 15px;
-            border-radius: 8px;
-            text-align: center;
-        }
-        
-        .instance-provider {
-            font-size: 0.9em;
-            opacity: 0.9;
-            margin-bottom: 5px;
-        }
-        
-        .instance-type {
-            font-size: 1.2em;
-            font-weight: bold;
-        }
-        
-        .actions {
-            margin-top: 30px;
-            text-align: center;
-        }
-        
-        .btn {
-            display: inline-block;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 12px 30px;
-            border-radius: 25px;
-            text-decoration: none;
-            margin: 0 10px;
-            transition: all 0.3s;
-            border: none;
-            cursor: pointer;
-            font-size: 1em;
-        }
-        
-        .btn:hover {
-            transform: scale(1.05);
-            box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
-        }
-        
-        .btn.secondary {
-            background: white;
-            color: #667eea;
-            border: 2px solid #667eea;
-        }
-        
-        .comparison-table {
-            width: 100%;
-            border-collapse: collapse;
-            margin: 20px 0;
-        }
-        
-        .comparison-table th,
-        .comparison-table td {
-            padding: 12px;
-            text-align: left;
-            border-bottom: 1px solid #ddd;
-        }
-        
-        .comparison-table th {
-            background: #667eea;
-            color: white;
-            font-weight: bold;
-        }
-        
-        .comparison-table tr:hover {
-            background: #f5f5f5;
-        }
-        
-        .category-header {
-            background: #f0f0f0;
-            font-weight: bold;
-            color: #667eea;
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('results.css') }}">
 </head>
 <body>
     <div class="container">
-        <h1>{{ '📊 Test Results' if test_type == 'bulk' else '🎯 Single Image Results' }}</h1>
+        <h1>{% block heading %}{% endblock %}</h1>
         <div class="summary">
             <p><strong>Test completed at:</strong> {{ timestamp }}</p>
-            {% if test_type == 'bulk' %}
-            <p><strong>Success rate:</strong> {{ successful }}/{{ total }} images ({{ success_rate }}%)</p>
-            {% endif %}
+            {% block summary %}{% endblock %}
         </div>
-        
-        {% if test_type == 'bulk' %}
-            {% for category in categories %}
-            <h2 style="color: #667eea; margin: 30px 0 15px 0;">{{ category }}</h2>
-            
-            {% for result in results_by_category[category] %}
-            <div class="result-card {% if 'error' in result %}error{% endif %}">
+        {% block content %}{% endblock %}
+        <div class="actions">
+            <a href="/" class="btn">🏠 Back to Home</a>
+            <a href="/bulk-test" class="btn secondary">📊 New Bulk Test</a>
+            <a href="/single-test" class="btn secondary">🎯 New Single Test</a>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+RESULTS_BULK_TEMPLATE = """
+{% extends 'results_base.html' %}
+{% block heading %}📊 Test Results{% endblock %}
+{% block summary %}
+            <p><strong>Success rate:</strong> {{ successful }}/{{ total }} images ({{ success_rate }}%)</p>
+{% endblock %}
+{% block content %}
+            {% for category, category_results in grouped_results %}
+            <h2 class="section-title">{{ category }}</h2>
+            {{ render_cards(category_results) }}
+            {% endfor %}
+{% endblock %}
+"""
+
+RESULTS_SINGLE_TEMPLATE = """
+{% extends 'results_base.html' %}
+{% block heading %}🎯 Single Image Results{% endblock %}
+{% block content %}
+            {% if not failed %}
+            <div class="result-card">
                 <div class="result-header">
-                    <h2>{{ result.description or result.image }}</h2>
-                    <span class="badge {% if 'error' in result %}error{% else %}success{% endif %}">
-                        {% if 'error' in result %}Failed{% else %}Success{% endif %}
-                    </span>
+                    <h2>{{ result.image }}</h2>
+                    <span class="badge success">Success</span>
                 </div>
                 
-                {% if 'error' not in result %}
                 <div class="metrics">
                     <div class="metric">
                         <div class="metric-label">Avg CPU</div>
@@ -1966,17 +1330,25 @@ RESULTS_TEMPLATE = """
                     </div>
                     <div class="metric">
                         <div class="metric-label">Avg Memory</div>
-                        <div class="metric-value">{{ format_memory(result.mem_avg_mb) }}</div>
+                        <div class="metric-value">{{ result.mem_avg_mb | memory }}</div>
                     </div>
                     <div class="metric">
                         <div class="metric-label">Peak Memory</div>
-                        <div class="metric-value">{{ format_memory(result.mem_peak_mb) }}</div>
+                        <div class="metric-value">{{ result.mem_peak_mb | memory }}</div>
+                    </div>
+                    <div class="metric">
+                        <div class="metric-label">Samples Collected</div>
+                        <div class="metric-value">{{ result.samples }}</div>
+                    </div>
+                    <div class="metric">
+                        <div class="metric-label">Test Duration</div>
+                        <div class="metric-value">{{ result.duration_sec }}s</div>
                     </div>
                 </div>
                 
                 <div class="recommendation">
                     <h3>☁️ Recommended Cloud Instances</h3>
-                    <p style="margin-bottom: 15px;">
+                    <p class="recommendation-summary">
                         <strong>{{ result.recommendation.vcpu }} vCPU(s), {{ result.recommendation.ram_gb }} GB RAM</strong>
                     </p>
                     <div class="instances">
@@ -1994,130 +1366,378 @@ RESULTS_TEMPLATE = """
                         </div>
                     </div>
                 </div>
-                {% else %}
-                <p style="color: #ef4444; font-weight: bold;">❌ Error: {{ result.error }}</p>
-                {% endif %}
             </div>
-            {% endfor %}
-            {% endfor %}
-        
-        {% else %}
-            {% if 'error' not in results[0] %}
+            {% else %}
+            <div class="result-card error">
+                <div class="result-header">
+                    <h2>{{ result.image or 'Test Failed' }}</h2>
+                    <span class="badge error">Error</span>
+                </div>
+                <p class="error-message">
+                    ❌ {{ result.error or 'No single test result found. Run a test first.' }}
+                </p>
+            </div>
+            {% endif %}
+{% endblock %}
+"""
+
+# Markup for one successful bulk result card, filled in by render_cards()
+RESULT_CARD_HTML = """
             <div class="result-card">
                 <div class="result-header">
-                    <h2>{{ results[0].image }}</h2>
+                    <h2>{title}</h2>
                     <span class="badge success">Success</span>
                 </div>
-                
                 <div class="metrics">
                     <div class="metric">
                         <div class="metric-label">Avg CPU</div>
-                        <div class="metric-value">{{ results[0].cpu_avg }}%</div>
+                        <div class="metric-value">{cpu_avg}%</div>
                     </div>
                     <div class="metric">
                         <div class="metric-label">Peak CPU</div>
-                        <div class="metric-value">{{ results[0].cpu_peak }}%</div>
+                        <div class="metric-value">{cpu_peak}%</div>
                     </div>
                     <div class="metric">
                         <div class="metric-label">Avg Memory</div>
-                        <div class="metric-value">{{ format_memory(results[0].mem_avg_mb) }}</div>
+                        <div class="metric-value">{mem_avg}</div>
                     </div>
                     <div class="metric">
                         <div class="metric-label">Peak Memory</div>
-                        <div class="metric-value">{{ format_memory(results[0].mem_peak_mb) }}</div>
-                    </div>
-                    <div class="metric">
-                        <div class="metric-label">Samples Collected</div>
-                        <div class="metric-value">{{ results[0].samples }}</div>
-                    </div>
-                    <div class="metric">
-                        <div class="metric-label">Test Duration</div>
-                        <div class="metric-value">{{ results[0].duration_sec }}s</div>
+                        <div class="metric-value">{mem_peak}</div>
                     </div>
                 </div>
                 
                 <div class="recommendation">
                     <h3>☁️ Recommended Cloud Instances</h3>
-                    <p style="margin-bottom: 15px;">
-                        <strong>{{ results[0].recommendation.vcpu }} vCPU(s), {{ results[0].recommendation.ram_gb }} GB RAM</strong>
+                    <p class="recommendation-summary">
+                        <strong>{vcpu} vCPU(s), {ram_gb} GB RAM</strong>
                     </p>
                     <div class="instances">
                         <div class="instance">
                             <div class="instance-provider">AWS</div>
-                            <div class="instance-type">{{ results[0].instances.aws }}</div>
+                            <div class="instance-type">{aws}</div>
                         </div>
                         <div class="instance">
                             <div class="instance-provider">Google Cloud</div>
-                            <div class="instance-type">{{ results[0].instances.gcp }}</div>
+                            <div class="instance-type">{gcp}</div>
                         </div>
                         <div class="instance">
                             <div class="instance-provider">Azure</div>
-                            <div class="instance-type">{{ results[0].instances.azure }}</div>
+                            <div class="instance-type">{azure}</div>
                         </div>
                     </div>
                 </div>
             </div>
-            {% else %}
-            <div class="result-card error">
-                <div class="result-header">
-                    <h2>{{ results[0].image or 'Test Failed' }}</h2>
-                    <span class="badge error">Error</span>
-                </div>
-                <p style="color: #ef4444; font-weight: bold; font-size: 1.1em;">
-                    ❌ {{ results[0].error }}
-                </p>
-            </div>
-            {% endif %}
-        {% endif %}
-        
-        <div class="actions">
-            <a href="/" class="btn">🏠 Back to Home</a>
-            <a href="/bulk-test" class="btn secondary">📊 New Bulk Test</a>
-            <a href="/single-test" class="btn secondary">🎯 New Single Test</a>
-        </div>
-    </div>
-</body>
-</html>
 """
 
 
+@functools.lru_cache(maxsize=1024)
+def format_memory(mb):
+    """
+    Format a size in MB for display, switching to KB below 1 MB.
+    Results store sizes already rounded to 2 decimals, so values repeat a lot.
+    """
+    return f"{mb:.2f} MB" if mb >= 1 else f"{mb*1024:.2f} KB"
+
+
+def render_cards(results):
+    """
+    Render the bulk result cards. Every card has the same shape, so this is a
+    plain format string per card instead of going through Jinja.
+    """
+    cards = []
+    for result in results:
+        recommendation = result['recommendation']
+        instances = result['instances']
+        cards.append(RESULT_CARD_HTML.format(
+            title=escape(result.get('description') or result['image']),
+            cpu_avg=result['cpu_avg'],
+            cpu_peak=result['cpu_peak'],
+            mem_avg=format_memory(result['mem_avg_mb']),
+            mem_peak=format_memory(result['mem_peak_mb']),
+            vcpu=recommendation['vcpu'],
+            ram_gb=recommendation['ram_gb'],
+            aws=escape(instances['aws']),
+            gcp=escape(instances['gcp']),
+            azure=escape(instances['azure'])
+        ))
+    return Markup(''.join(cards))
+
+
+@functools.lru_cache(maxsize=None)
+def asset_url(filename):
+    """URL of a file in static/ with a content-hash query, so it can be cached forever."""
+    with open(os.path.join(app.static_folder, filename), 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:12]
+    return f'{app.static_url_path}/{filename}?v={digest}'
+
+
+def minify_html(source):
+    """
+    Drop a template's indentation and blank lines before Jinja compiles it.
+    Line breaks are kept, so text and inline elements stay separated; the
+    templates have no <pre> or inline scripts whose whitespace matters.
+    """
+    return '\n'.join(line.strip() for line in source.splitlines() if line and not line.isspace())
+
+
+TEMPLATE_SOURCES = {
+    name: minify_html(source)
+    for name, source in {
+        'home.html': HOME_TEMPLATE,
+        'bulk_test.html': BULK_TEST_TEMPLATE,
+        'single_test.html': SINGLE_TEST_TEMPLATE,
+        'live_test.html': LIVE_TEST_TEMPLATE,
+        'results_base.html': RESULTS_BASE_TEMPLATE,
+        'results_bulk.html': RESULTS_BULK_TEMPLATE,
+        'results_single.html': RESULTS_SINGLE_TEMPLATE,
+    }.items()
+}
+
+# Output of `python app.py --compile-templates`. The directory is named after a
+# digest of the sources, so editing a template never picks up stale modules.
+COMPILED_TEMPLATES_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    'compiled_templates',
+    hashlib.sha1(''.join(name + source for name, source in sorted(TEMPLATE_SOURCES.items())).encode('utf-8')).hexdigest()[:12]
+)
+
+# Prefer the precompiled modules (loading them is a plain import); otherwise
+# compile from source, using the on-disk bytecode cache (in the system temp
+# dir) to skip lexing/parsing when a worker restarts
+template_loader = jinja2.DictLoader(TEMPLATE_SOURCES)
+if os.path.isdir(COMPILED_TEMPLATES_DIR):
+    template_loader = jinja2.ChoiceLoader([jinja2.ModuleLoader(COMPILED_TEMPLATES_DIR), template_loader])
+
+# Dedicated Jinja environment: every template is compiled once at import and
+# never reloaded, so rendering is just a call into the compiled code
+jinja_env = jinja2.Environment(
+    loader=template_loader,
+    bytecode_cache=jinja2.FileSystemBytecodeCache(pattern='docker_resource_estimator_%s.cache'),
+    autoescape=True,
+    auto_reload=False,
+    cache_size=-1
+)
+jinja_env.filters['memory'] = format_memory
+jinja_env.globals['asset_url'] = asset_url
+jinja_env.globals['render_cards'] = render_cards
+
+HOME_TMPL = jinja_env.get_template('home.html')
+BULK_TEST_TMPL = jinja_env.get_template('bulk_test.html')
+SINGLE_TEST_TMPL = jinja_env.get_template('single_test.html')
+LIVE_TEST_TMPL = jinja_env.get_template('live_test.html')
+RESULTS_BULK_TMPL = jinja_env.get_template('results_bulk.html')
+RESULTS_SINGLE_TMPL = jinja_env.get_template('results_single.html')
+
+# The static pages only take constants, so render them once as well,
+# straight to the encoded bytes the responses send
+HOME_HTML = HOME_TMPL.render().encode('utf-8')
+BULK_TEST_HTML = BULK_TEST_TMPL.render().encode('utf-8')
+SINGLE_TEST_HTML = SINGLE_TEST_TMPL.render().encode('utf-8')
+LIVE_TEST_HTML = LIVE_TEST_TMPL.render(presets=LIVE_TEST_PRESETS).encode('utf-8')
+
+
+def compress_page(html):
+    """
+    Gzip and Brotli copies of a rendered page (Brotli is None when not installed).
+    Pages are compressed once and then reused, so both run at their best level.
+    """
+    html_br = brotli.compress(html, quality=11) if brotli is not None else None
+    return gzip.compress(html, compresslevel=9), html_br
+
+
+# Compress the static pages once too; most browsers accept it
+HOME_HTML_GZ, HOME_HTML_BR = compress_page(HOME_HTML)
+BULK_TEST_HTML_GZ, BULK_TEST_HTML_BR = compress_page(BULK_TEST_HTML)
+SINGLE_TEST_HTML_GZ, SINGLE_TEST_HTML_BR = compress_page(SINGLE_TEST_HTML)
+LIVE_TEST_HTML_GZ, LIVE_TEST_HTML_BR = compress_page(LIVE_TEST_HTML)
+
+# Strong validators for the static pages, so a repeat visit revalidates to a 304
+HOME_HTML_ETAG = hashlib.sha1(HOME_HTML).hexdigest()[:16]
+BULK_TEST_HTML_ETAG = hashlib.sha1(BULK_TEST_HTML).hexdigest()[:16]
+SINGLE_TEST_HTML_ETAG = hashlib.sha1(SINGLE_TEST_HTML).hexdigest()[:16]
+LIVE_TEST_HTML_ETAG = hashlib.sha1(LIVE_TEST_HTML).hexdigest()[:16]
+
+
+def json_response(obj):
+    """jsonify() without the str round-trip when orjson can emit bytes directly."""
+    if orjson is not None:
+        return Response(orjson.dumps(obj), mimetype='application/json')
+    return jsonify(obj)
+
+
+def static_page(html, html_gz, etag=None, html_br=None):
+    """
+    Serve a pre-rendered page, using a compressed copy when the client accepts it
+    (Brotli over gzip). With an etag the page is revalidated on each visit and
+    answered with a 304 while it is unchanged; the URLs aren't fingerprinted, so
+    it isn't cached blind.
+    An html_gz of None gzips the page only then, for pages rendered per request.
+    """
+    if html_br is not None and request.accept_encodings['br']:
+        body, encoding = html_br, 'br'
+    elif request.accept_encodings['gzip']:
+        if html_gz is None:
+            html_gz = gzip.compress(html.encode('utf-8'))
+        body, encoding = html_gz, 'gzip'
+    else:
+        body, encoding = html, None
+    
+    if etag is not None:
+        # Every encoding shares one ETag value, so tag the compressed variants apart
+        etag = f'{etag}-{encoding}' if encoding else etag
+        if request.if_none_match.contains(etag):
+            response = Response(status=304, headers={'Vary': 'Accept-Encoding'})
+            response.set_etag(etag)
+            response.cache_control.no_cache = True
+            return response
+    
+    response = Response(body, mimetype='text/html', headers={'Vary': 'Accept-Encoding'})
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if etag is not None:
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+    return response
+
+
+def gzip_stream(chunks):
+    """
+    Gzip a stream of text chunks on the fly. Each chunk is sync-flushed so the
+    browser can still render the page progressively.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    for chunk in chunks:
+        yield compressor.compress(chunk.encode('utf-8')) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def streamed_page(chunks):
+    """Stream a page, gzipped when the client accepts it."""
+    if request.accept_encodings['gzip']:
+        return Response(stream_with_context(gzip_stream(chunks)), mimetype='text/html',
+                        headers={'Content-Encoding': 'gzip', 'Vary': 'Accept-Encoding'})
+    return Response(stream_with_context(chunks), mimetype='text/html',
+                    headers={'Vary': 'Accept-Encoding'})
+
+
+@app.after_request
+def cache_versioned_assets(response):
+    """Static files requested with a ?v= fingerprint never change, so cache them for a year."""
+    if 'v' in request.args and request.path.startswith(app.static_url_path + '/'):
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    return response
+
+
+def mark_trusted_fields(result):
+    """
+    Return a copy of a successful result with the numeric and instance fields
+    wrapped in Markup, so autoescape doesn't scan them. These all come from our
+    own rounding and instance table; image names and errors stay escaped.
+    """
+    trusted = dict(result)
+    for key in ('cpu_avg', 'cpu_peak', 'samples', 'duration_sec'):
+        if key in trusted:
+            trusted[key] = Markup(trusted[key])
+    trusted['recommendation'] = {
+        key: Markup(value) for key, value in result['recommendation'].items()
+    }
+    trusted['instances'] = {
+        key: Markup(value) for key, value in result['instances'].items()
+    }
+    return trusted
+
+
 # Routes
 @app.route('/')
 def home():
-    return render_template_string(HOME_TEMPLATE)
+    return static_page(HOME_HTML, HOME_HTML_GZ, HOME_HTML_ETAG, HOME_HTML_BR)
 
 
 @app.route('/bulk-test')
 def bulk_test():
-    return render_template_string(BULK_TEST_TEMPLATE)
+    return static_page(BULK_TEST_HTML, BULK_TEST_HTML_GZ, BULK_TEST_HTML_ETAG, BULK_TEST_HTML_BR)
 
 
 @app.route('/single-test')
 def single_test():
-    return render_template_string(SINGLE_TEST_TEMPLATE)
+    return static_page(SINGLE_TEST_HTML, SINGLE_TEST_HTML_GZ, SINGLE_TEST_HTML_ETAG, SINGLE_TEST_HTML_BR)
 
 
 @app.route('/live-test')
 def live_test():
-    return render_template_string(LIVE_TEST_TEMPLATE)
+    return static_page(LIVE_TEST_HTML, LIVE_TEST_HTML_GZ, LIVE_TEST_HTML_ETAG, LIVE_TEST_HTML_BR)
 
 
 @app.route('/api/start-bulk-test', methods=['POST'])
 def api_start_bulk_test():
     data = request.json
     duration = data.get('duration', 20)
+    # Concurrent containers; more finishes sooner but the samples share the host
+    try:
+        workers = int(data.get('max_workers', BULK_TEST_WORKERS))
+    except (TypeError, ValueError):
+        workers = BULK_TEST_WORKERS
+    workers = max(1, min(workers, len(DEFAULT_TEST_IMAGES)))
+    
+    with progress_lock:
+        # Only one bulk run at a time; report the one already in progress
+        if test_progress['status'] == 'running':
+            return jsonify({'status': 'running', 'job_id': test_progress['job_id']})
+        
+        job_id = uuid.uuid4().hex
+        test_progress['status'] = 'running'
+        test_progress['job_id'] = job_id
+        publish_progress()
     
-    # Start tests in background thread
-    thread = threading.Thread(target=run_bulk_tests, args=(duration,))
-    thread.daemon = True
-    thread.start()
+    # Run tests on the bulk worker
+    bulk_executor.submit(run_bulk_tests, duration, workers).add_done_callback(finish_bulk_job)
     
-    return jsonify({'status': 'started'})
+    return jsonify({'status': 'started', 'job_id': job_id})
 
 
 @app.route('/api/bulk-test-progress')
 def api_bulk_test_progress():
-    return jsonify(test_progress)
+    view = progress_snapshot()
+    version = view[-1]
+    
+    # Nothing changed since the client's last poll: answer 304 with no body
+    if request.if_none_match.contains(version):
+        response = Response(status=304)
+    else:
+        response = json_response(progress_payload(view))
+    response.set_etag(version)
+    response.cache_control.no_cache = True
+    return response
+
+
+@app.route('/api/bulk-test-stream')
+def api_bulk_test_stream():
+    """Push bulk progress as Server-Sent Events instead of being polled."""
+    return Response(progress_events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/api/bulk-test-results')
+def api_bulk_test_results():
+    """
+    Results of the current bulk run. The progress endpoint stays small, so clients
+    fetch this once when its 'version' changes instead of on every poll.
+    """
+    with progress_lock:
+        results = list(test_progress['results'])
+        version = f"{test_progress['job_id']}-{test_progress['revision']}"
+    
+    if request.if_none_match.contains(version):
+        response = Response(status=304)
+    else:
+        response = json_response({'version': version, 'results': results})
+    response.set_etag(version)
+    response.cache_control.no_cache = True
+    return response
 
 
 @app.route('/api/start-single-test', methods=['POST'])
@@ -2128,14 +1748,19 @@ def api_start_single_test():
     command = data.get('command')
     
     result = estimate_single_image(image, duration, command)
+    result['completed_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
-    # Store in session
-    session['single_test_result'] = result
+    # Keep the result server-side; the results page looks it up by token
+    token = secrets.token_urlsafe(8)
+    with single_results_lock:
+        single_results[token] = result
+        if len(single_results) > SINGLE_RESULTS_LIMIT:
+            single_results.popitem(last=False)
     
     if 'error' in result:
-        return jsonify({'status': 'error', 'error': result['error']})
+        return jsonify({'status': 'error', 'error': result['error'], 'token': token})
     
-    return jsonify({'status': 'success'})
+    return jsonify({'status': 'success', 'token': token})
 
 
 @app.route('/api/start-live-test', methods=['POST'])
@@ -2149,16 +1774,13 @@ def api_start_live_test():
     port_mapping = data.get('port_mapping')
     
     try:
-        client = docker.from_env()
+        client = get_docker_client()
         
         # Check/pull image
         try:
-            image = client.images.get(image_name)
-        except docker.errors.ImageNotFound:
-            try:
-                image = client.images.pull(image_name)
-            except docker.errors.APIError as e:
-                return jsonify({'status': 'error', 'error': f'Failed to pull image: {str(e)}'})
+            ensure_image(client, image_name)
+        except docker.errors.APIError as e:
+            return jsonify({'status': 'error', 'error': f'Failed to pull image: {str(e)}'})
         
         # Parse port mapping
         ports = None
@@ -2191,6 +1813,7 @@ def api_start_live_test():
             
             container = client.containers.run(image_name, **container_args)
         except docker.errors.APIError as e:
+            forget_image(image_name)
             # Try fallback commands only if custom command wasn't specified
             if "executable file not found" in str(e) and not custom_command:
                 try:
@@ -2206,35 +1829,35 @@ def api_start_live_test():
             else:
                 return jsonify({'status': 'error', 'error': f'Failed to start container: {str(e)}'})
         
-        # Wait a moment for container to fully start
-        time.sleep(2)
-        
-        # Verify container is running and get port info
-        try:
-            container.reload()
-            if container.status != 'running':
-                return jsonify({'status': 'error', 'error': f'Container started but not running. Status: {container.status}'})
-            
-            # Get actual port bindings
-            port_bindings = container.attrs.get('NetworkSettings', {}).get('Ports', {})
-            if ports and port_bindings:
-                port_info_detailed = f'{port_info} - Access at http://localhost:{host_port}'
-            else:
-                port_info_detailed = port_info
-        except Exception as e:
-            port_info_detailed = port_info
+        # containers.run only returns once the requested ports are bound
+        port_info_detailed = f'{port_info} - Access at http://localhost:{host_port}' if ports else None
         
-        # Store container info
+        # Store container info. Nothing waits for the container to settle: the
+        # phase stays 'starting' until the first stats frame, and the exit
+        # watcher reports a container that stops right away to the stats stream
         container_id = container.id
-        live_containers[container_id] = {
+        changed = threading.Condition()
+        container_info = {
             'container': container,
             'image': image_name,
             'start_time': time.time(),
-            'cpu_history': [],
-            'mem_history': [],
+            'cpu_summary': (0, 0.0, 0),  # running (count, total, peak)
+            'mem_summary': (0, 0.0, 0),
+            'cpu_current': 0,
+            'mem_current': 0,
+            'cpu_scale': None,
+            'phase': 'starting',
+            'exited': watch_container_exit(container, changed),
+            'changed': changed,
             'samples': 0,
-            'logs': ''
+            'log': deque(),
+            'log_kept': 0,
+            'log_total': 0
         }
+        with live_containers_lock:
+            live_containers[container_id] = container_info
+        follow_live_stats(container_info, client.api, container_id)
+        follow_live_logs(container_info, container)
         
         return jsonify({
             'status': 'success',
@@ -2251,83 +1874,45 @@ def api_live_test_stats():
     """Get current stats for a running container."""
     global live_containers
     
-    container_id = request.args.get('container_id')
+    container_info = live_containers.get(request.args.get('container_id'))
     
-    if container_id not in live_containers:
+    if container_info is None:
         return jsonify({'status': 'error', 'error': 'Container not found'})
     
-    container_info = live_containers[container_id]
-    container = container_info['container']
-    
     try:
-        # Check if container is still running
-        container.reload()
-        if container.status != 'running':
+        # The exit watcher flips this as soon as the container stops
+        if container_info['exited'].is_set():
             return jsonify({'status': 'error', 'error': 'Container is not running'})
         
-        # Get stats (non-streaming)
-        stats = container.stats(stream=False)
-        
-        # CPU calculation
-        cpu_stats = stats.get("cpu_stats", {})
-        precpu_stats = stats.get("precpu_stats", {})
-        
-        cpu_total = cpu_stats.get("cpu_usage", {}).get("total_usage", 0)
-        precpu_total = precpu_stats.get("cpu_usage", {}).get("total_usage", 0)
-        
-        system_cpu = cpu_stats.get("system_cpu_usage", 0)
-        presystem_cpu = precpu_stats.get("system_cpu_usage", 0)
-        
-        cpu_delta = cpu_total - precpu_total
-        system_delta = system_cpu - presystem_cpu
-        
-        online_cpus = cpu_stats.get("online_cpus")
-        if not online_cpus:
-            percpu_usage = cpu_stats.get("cpu_usage", {}).get("percpu_usage", [])
-            online_cpus = len(percpu_usage) if percpu_usage else 1
-        
-        cpu_percent = 0
-        if system_delta > 0 and cpu_delta >= 0:
-            cpu_percent = (cpu_delta / system_delta) * online_cpus * 100.0
-        
-        # Memory
-        mem_usage = stats.get("memory_stats", {}).get("usage", 0) / (1024 ** 2)
-        
-        # Update history
-        container_info['cpu_history'].append(cpu_percent)
-        container_info['mem_history'].append(mem_usage)
-        container_info['samples'] += 1
-        
-        # Calculate stats
-        cpu_avg = statistics.mean(container_info['cpu_history']) if container_info['cpu_history'] else 0
-        cpu_peak = max(container_info['cpu_history']) if container_info['cpu_history'] else 0
-        mem_avg = statistics.mean(container_info['mem_history']) if container_info['mem_history'] else 0
-        mem_peak = max(container_info['mem_history']) if container_info['mem_history'] else 0
-        
-        # Get container logs (last 500 lines to avoid overload)
+        # Only the output the client hasn't seen yet (follow_live_logs collects it)
         try:
-            logs = container.logs(tail=500).decode('utf-8', errors='replace')
-            container_info['logs'] = logs
-        except:
-            logs = container_info['logs']
+            log_offset = int(request.args.get('log_offset', 0))
+        except ValueError:
+            log_offset = 0
         
-        return jsonify({
-            'status': 'success',
-            'cpu_current': cpu_percent,
-            'cpu_avg': cpu_avg,
-            'cpu_peak': cpu_peak,
-            'mem_current': mem_usage,
-            'mem_avg': mem_avg,
-            'mem_peak': mem_peak,
-            'samples': container_info['samples'],
-            'runtime': time.time() - container_info['start_time'],
-            'logs': logs
-        })
+        return json_response(live_stats_payload(container_info, log_offset))
         
     except Exception as e:
         return jsonify({'status': 'error', 'error': str(e)})
 
 
+@app.route('/api/live-test-stream')
+def api_live_test_stream():
+    """Push a live container's stats and output as Server-Sent Events."""
+    container_info = live_containers.get(request.args.get('container_id'))
+    if container_info is None:
+        return jsonify({'status': 'error', 'error': 'Container not found'}), 404
+    
+    # EventSource sends the last event id back when it reconnects
+    try:
+        log_offset = int(request.headers.get('Last-Event-ID') or request.args.get('log_offset', 0))
+    except ValueError:
+        log_offset = 0
+    
+    return Response(live_events(container_info, log_offset), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
 @app.route('/api/stop-live-test', methods=['POST'])
 def api_stop_live_test():
     """Stop and remove a live test container."""
@@ -2336,23 +1921,26 @@ def api_stop_live_test():
     data = request.json
     container_id = data.get('container_id')
     
-    if container_id not in live_containers:
+    # Claim the entry so a second stop of the same container finds nothing
+    with live_containers_lock:
+        container_info = live_containers.pop(container_id, None)
+    
+    if container_info is None:
         return jsonify({'status': 'error', 'error': 'Container not found'})
     
-    container_info = live_containers[container_id]
     container = container_info['container']
     
     try:
         # Calculate recommendations before stopping
-        cpu_history = container_info['cpu_history']
-        mem_history = container_info['mem_history']
+        cpu_summary = container_info['cpu_summary']
+        mem_summary = container_info['mem_summary']
         
         recommendations = None
-        if cpu_history and mem_history:
-            cpu_avg = statistics.mean(cpu_history)
-            cpu_peak = max(cpu_history)
-            mem_avg = statistics.mean(mem_history)
-            mem_peak = max(mem_history)
+        if cpu_summary[0] and mem_summary[0]:
+            cpu_avg = summary_mean(cpu_summary)
+            cpu_peak = cpu_summary[2]
+            mem_avg = summary_mean(mem_summary)
+            mem_peak = mem_summary[2]
             
             # Calculate recommended resources
             recommended_vcpu = max(1, round(cpu_peak / 80))
@@ -2375,9 +1963,7 @@ def api_stop_live_test():
                 }
             }
         
-        container.stop()
-        container.remove()
-        del live_containers[container_id]
+        remove_container(container.client.api, container.id)
         
         return jsonify({
             'status': 'success',
@@ -2385,6 +1971,9 @@ def api_stop_live_test():
         })
         
     except Exception as e:
+        # Put it back so the stop can be retried
+        with live_containers_lock:
+            live_containers.setdefault(container_id, container_info)
         return jsonify({'status': 'error', 'error': str(e)})
 
 
@@ -2393,47 +1982,79 @@ def results():
     test_type = request.args.get('type', 'single')
     
     if test_type == 'bulk':
-        results = test_progress['results']
-        
-        # Group by category
-        categories = []
-        results_by_category = {}
-        for result in results:
-            if 'error' not in result:
-                category = result.get('category', 'Other')
-                if category not in categories:
-                    categories.append(category)
-                    results_by_category[category] = []
-                results_by_category[category].append(result)
+        # Copy so a run that is still appending can't change the list mid-render
+        with progress_lock:
+            total = len(test_progress['results'])
+            successful = test_progress['successful']
+            # Category names come from DEFAULT_TEST_IMAGES, not from user input
+            grouped_results = [
+                (Markup(category), list(category_results))
+                for category, category_results in test_progress['by_category'].items()
+            ]
+            status = test_progress['status']
+            revision = test_progress['revision']
+            completed_at = test_progress['completed_at']
         
-        successful = len([r for r in results if 'error' not in r])
-        total = len(results)
         success_rate = round((successful / total) * 100) if total > 0 else 0
-        
-        return render_template_string(
-            RESULTS_TEMPLATE,
-            test_type=test_type,
-            results=results,
-            categories=categories,
-            results_by_category=results_by_category,
+        context = dict(
+            grouped_results=grouped_results,
             successful=successful,
             total=total,
-            success_rate=success_rate,
+            success_rate=success_rate
+        )
+        
+        # A finished run can't change any more, so refreshes reuse its page
+        if status == 'complete':
+            page = bulk_results_cache.get(revision)
+            if page is None:
+                html = RESULTS_BULK_TMPL.render(timestamp=completed_at, **context).encode('utf-8')
+                html_gz, html_br = compress_page(html)
+                page = (html, html_gz, html_br)
+                bulk_results_cache.clear()
+                bulk_results_cache[revision] = page
+            html, html_gz, html_br = page
+            return static_page(html, html_gz, html_br=html_br)
+        
+        # Stream the page card by card instead of building it as one string
+        stream = RESULTS_BULK_TMPL.stream(
             timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            format_memory=lambda mb: f"{mb:.2f} MB" if mb >= 1 else f"{mb*1024:.2f} KB"
+            **context
         )
+        stream.enable_buffering(size=20)
+        return streamed_page(stream)
     else:
-        result = session.get('single_test_result', {})
-        return render_template_string(
-            RESULTS_TEMPLATE,
-            test_type=test_type,
-            results=[result],
-            timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            format_memory=lambda mb: f"{mb:.2f} MB" if mb >= 1 else f"{mb*1024:.2f} KB"
+        with single_results_lock:
+            result = single_results.get(request.args.get('t', ''), {})
+        # Decided here once so the template only tests a flag; an empty result
+        # (unknown or expired token) is shown as a failure, not a broken card
+        failed = 'error' in result or 'recommendation' not in result
+        html = RESULTS_SINGLE_TMPL.render(
+            result=result if failed else mark_trusted_fields(result),
+            failed=failed,
+            timestamp=result.get('completed_at', '')
         )
+        return static_page(html, None)
+
+
+def compile_templates():
+    """Precompile every page template to a Python module in COMPILED_TEMPLATES_DIR."""
+    build_env = jinja_env.overlay(loader=jinja2.DictLoader(TEMPLATE_SOURCES))
+    build_env.compile_templates(COMPILED_TEMPLATES_DIR, zip=None)
+    print(f"✅ Templates compiled to {COMPILED_TEMPLATES_DIR}")
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Docker Resource Estimator - Web Application")
+    parser.add_argument('--compile-templates', action='store_true',
+                        help='Precompile the page templates to Python modules and exit')
+    parser.add_argument('--debug', action='store_true',
+                        help="Run Flask's development server with the debugger and reloader")
+    args = parser.parse_args()
+    
+    if args.compile_templates:
+        compile_templates()
+        sys.exit(0)
+    
     print("=" * 80)
     print("🐳 Docker Resource Estimator - Web Application")
     print("=" * 80)
@@ -2446,4 +2067,11 @@ if __name__ == '__main__':
     print("\n⏹️  Press Ctrl+C to stop the server\n")
     print("=" * 80)
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Test progress and live containers live in this process, so always serve
+    # from a single process with a thread pool rather than several workers
+    if args.debug:
+        app.run(debug=True, host='0.0.0.0', port=5000)
+    elif serve is not None:
+        serve(app, host='0.0.0.0', port=5000, threads=SERVER_THREADS)
+    else:
+        app.run(host='0.0.0.0', port=5000, threaded=True)
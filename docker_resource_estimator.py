@@ -1,21 +1,36 @@
 import docker
+import requests
 import time
-import statistics
 import json
+import os
 import sys
 import argparse
-import io
+import re
+import bisect
+import threading
 import subprocess
 import platform
 
-# Fix encoding for Windows PowerShell
+# orjson parses the stats responses straight from bytes and is several times
+# faster than the stdlib; fall back to json when it isn't installed
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# Fix encoding for Windows PowerShell; reconfigure() keeps the same stream
+# objects, so importing this module from the web app is harmless
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+# Host OS, looked up once; platform.system() can spawn a subprocess on some platforms
+HOST_SYSTEM = platform.system()
 
 def stop_docker_engine():
     """Stop Docker Engine/Desktop after execution."""
-    system = platform.system()
+    system = HOST_SYSTEM
     
     print("\n🛑 Stopping Docker Engine...")
     
@@ -53,23 +68,295 @@ def stop_docker_engine():
         print(f"⚠️  Could not stop Docker Engine: {e}")
         print("   You may need to stop it manually")
 
-def estimate_resources(image_name: str, test_duration: int = 30, custom_command: str = None, stop_docker: bool = False):
-    client = docker.from_env()
+# Default seconds between samples; both samplers keep to a fixed monotonic grid
+SAMPLE_INTERVAL = 1.0
+
+# Mount point of the cgroup filesystem on Linux hosts
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+def find_cgroup_paths(container_id):
+    """
+    Locate a container's CPU and memory cgroup files.
+    Returns (cpu_path, mem_path), or None when they can't be read from here
+    (non-Linux host, Docker Desktop VM, missing permissions).
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    
+    candidates = [
+        # cgroup v2: systemd driver, then cgroupfs driver
+        (f'{CGROUP_ROOT}/system.slice/docker-{container_id}.scope/cpu.stat',
+         f'{CGROUP_ROOT}/system.slice/docker-{container_id}.scope/memory.current'),
+        (f'{CGROUP_ROOT}/docker/{container_id}/cpu.stat',
+         f'{CGROUP_ROOT}/docker/{container_id}/memory.current'),
+        # cgroup v1: cgroupfs driver, then systemd driver
+        (f'{CGROUP_ROOT}/cpuacct/docker/{container_id}/cpuacct.usage',
+         f'{CGROUP_ROOT}/memory/docker/{container_id}/memory.usage_in_bytes'),
+        (f'{CGROUP_ROOT}/cpuacct/system.slice/docker-{container_id}.scope/cpuacct.usage',
+         f'{CGROUP_ROOT}/memory/system.slice/docker-{container_id}.scope/memory.usage_in_bytes'),
+    ]
+    
+    for cpu_path, mem_path in candidates:
+        try:
+            read_cgroup_cpu_ns(cpu_path)
+            read_cgroup_int(mem_path)
+        except (OSError, ValueError):
+            continue
+        return cpu_path, mem_path
+    
+    return None
+
+def read_cgroup_int(path):
+    """Read a single-integer cgroup file."""
+    with open(path) as f:
+        return int(f.read())
+
+def read_cgroup_cpu_ns(path):
+    """Read total CPU time in nanoseconds from cpu.stat (v2) or cpuacct.usage (v1)."""
+    with open(path, 'rb') as f:
+        return parse_cgroup_cpu_ns(f.read(), path)
+
+def parse_cgroup_cpu_ns(data, path):
+    """Parse the contents of a cpu.stat or cpuacct.usage file into nanoseconds."""
+    if not path.endswith('cpu.stat'):
+        return int(data)
+    
+    for line in data.splitlines():
+        if line.startswith(b'usage_usec '):
+            return int(line.split()[1]) * 1000
+    raise ValueError(f'usage_usec missing from {path}')
+
+def cgroup_samples(cgroup_paths, deadline, exited, interval=SAMPLE_INTERVAL):
+    """
+    Yield (cpu_percent, mem_mb) every interval seconds from the container's cgroup
+    files until `deadline` (a time.monotonic() value), or as soon as the `exited`
+    Event is set or the cgroup disappears.
+    """
+    cpu_path, mem_path = cgroup_paths
+    monotonic = time.monotonic
+    pread = os.pread
+    
+    # Keep both files open and pread them from offset 0 each tick, so a
+    # sample costs two read syscalls instead of open/read/close twice
+    cpu_fd = os.open(cpu_path, os.O_RDONLY)
+    try:
+        mem_fd = os.open(mem_path, os.O_RDONLY)
+    except OSError:
+        os.close(cpu_fd)
+        raise
+    
+    try:
+        prev_cpu = parse_cgroup_cpu_ns(pread(cpu_fd, 4096, 0), cpu_path)
+        prev_time = monotonic()
+        next_tick = prev_time
+        
+        while prev_time < deadline:
+            # Tick on a fixed schedule so time spent sampling doesn't add drift
+            next_tick += interval
+            if exited.wait(timeout=max(0.0, next_tick - monotonic())):
+                return
+            try:
+                cpu_ns = parse_cgroup_cpu_ns(pread(cpu_fd, 4096, 0), cpu_path)
+                mem_bytes = int(pread(mem_fd, 64, 0))
+            except (OSError, ValueError):
+                # The cgroup is removed as soon as the container exits
+                return
+            now = monotonic()
+            
+            # Same scale as the stats API: 100% is one fully busy core
+            cpu_percent = (cpu_ns - prev_cpu) / ((now - prev_time) * 1e9) * 100.0
+            yield cpu_percent, mem_bytes / (1024 ** 2)
+            
+            prev_cpu = cpu_ns
+            prev_time = now
+    finally:
+        os.close(cpu_fd)
+        os.close(mem_fd)
+
+def add_sample(summary, value):
+    """Fold a value into a running (count, total, peak) summary."""
+    count, total, peak = summary
+    return count + 1, total + value, value if value > peak else peak
+
+def summary_mean(summary):
+    """Average of a (count, total, peak) summary, 0 when it is empty."""
+    count, total, _ = summary
+    return total / count if count else 0
+
+# dockerd writes stats as compact JSON in a fixed field order, so the numbers
+# the samplers use can be picked out without parsing the whole frame
+CPU_FIELDS_RE = re.compile(rb'"cpu_stats":\{"cpu_usage":\{"total_usage":(\d+)[^}]*\},"system_cpu_usage":(\d+)')
+MEMORY_USAGE_RE = re.compile(rb'"memory_stats":\{"usage":(\d+)')
+
+def fetch_stats(api, container_id):
+    """
+    Fetch one one-shot stats frame for a container as raw JSON bytes, with a GET
+    on the client's session (APIClient.stats() would always parse it with the
+    stdlib json module). Engines older than API 1.41 ignore one-shot and take
+    about a second to answer.
+    """
+    response = api.get(
+        f"{api.base_url}/v{api.api_version}/containers/{container_id}/stats",
+        params={"stream": "false", "one-shot": "true"},
+        timeout=api.timeout
+    )
+    response.raise_for_status()
+    return response.content
+
+def stats_fields(stats_raw):
+    """
+    Return (container CPU total, system CPU total, memory bytes) from a raw
+    stats frame. Frames the patterns don't match (other engines, or the
+    empty frame of an exited container) are parsed in full; a missing section
+    raises KeyError.
+    """
+    cpu_match = CPU_FIELDS_RE.search(stats_raw)
+    mem_match = MEMORY_USAGE_RE.search(stats_raw)
+    if cpu_match and mem_match:
+        cpu_total, system_cpu = cpu_match.groups()
+        return int(cpu_total), int(system_cpu), int(mem_match.group(1))
+    
+    stats = json_loads(stats_raw)
+    cpu_stats = stats["cpu_stats"]
+    return (cpu_stats["cpu_usage"]["total_usage"], cpu_stats["system_cpu_usage"],
+            stats["memory_stats"]["usage"])
+
+def stats_online_cpus(stats_raw):
+    """Number of CPUs a raw stats frame reports; fixed for the container's lifetime."""
+    cpu_stats = json_loads(stats_raw)["cpu_stats"]
+    online_cpus = cpu_stats.get("online_cpus")
+    if not online_cpus:
+        percpu_usage = cpu_stats["cpu_usage"].get("percpu_usage", [])
+        online_cpus = len(percpu_usage) if percpu_usage else 1
+    return online_cpus
+
+def docker_api_samples(api, container_id, deadline, exited, interval=SAMPLE_INTERVAL):
+    """
+    Yield (cpu_percent, mem_mb) every interval seconds from one-shot Docker stats
+    requests until `deadline` (a time.monotonic() value), or until the `exited`
+    Event is set or dockerd reports the container gone. A one-shot request
+    answers at once instead of making dockerd wait for a second sample, so CPU
+    percent is taken against our own previous sample; it is None for the first.
+    """
+    monotonic = time.monotonic
+    previous = None  # (container CPU total, system CPU total)
+    online_cpus = None  # read once, from the first frame
+    next_tick = monotonic()
+    
+    while monotonic() < deadline:
+        try:
+            stats_raw = fetch_stats(api, container_id)
+            cpu_total, system_cpu, mem_bytes = stats_fields(stats_raw)
+        except requests.exceptions.HTTPError:
+            # dockerd refused the request (e.g. the container is gone); keep
+            # the samples taken so far
+            return
+        except KeyError:
+            # dockerd sends an empty frame once the container has exited
+            return
+        if online_cpus is None:
+            online_cpus = stats_online_cpus(stats_raw)
+        
+        # Calculate CPU percentage from the deltas since the previous sample
+        cpu_percent = None
+        if previous is not None:
+            cpu_delta = cpu_total - previous[0]
+            system_delta = system_cpu - previous[1]
+            if system_delta > 0 and cpu_delta >= 0:
+                cpu_percent = (cpu_delta / system_delta) * online_cpus * 100.0
+        previous = (cpu_total, system_cpu)
+        
+        yield cpu_percent, mem_bytes / (1024 ** 2)
+        
+        # Fixed schedule, so the request time doesn't stretch the interval
+        next_tick += interval
+        if exited.wait(timeout=max(0.0, next_tick - monotonic())):
+            return
+
+# Instance tiers from smallest to largest; get_instance_recommendations returns
+# these dicts as-is, so callers must not mutate them
+INSTANCE_TIERS = (
+    {"aws": "t3.micro", "gcp": "e2-micro", "azure": "B1s"},
+    {"aws": "t3.small", "gcp": "e2-small", "azure": "B1ms"},
+    {"aws": "t3.medium", "gcp": "e2-medium", "azure": "B2s"},
+    {"aws": "t3.large+", "gcp": "e2-standard+", "azure": "B2ms+"},
+)
+
+# INSTANCE_TIERS index by vCPU row (1, 2, more) and RAM column (up to 1 GB,
+# up to 2 GB, more); a single vCPU that needs more than 2 GB jumps to large
+RAM_LIMITS_GB = (1, 2)
+TIER_TABLE = (
+    (0, 1, 3),
+    (2, 2, 2),
+    (3, 3, 3),
+)
+
+def get_instance_recommendations(vcpu, ram_gb):
+    """
+    Get cloud instance recommendations based on vCPU and RAM, as a TIER_TABLE
+    lookup. The shared tier dict must not be mutated.
+    """
+    row = min(vcpu, 3) - 1
+    column = bisect.bisect_left(RAM_LIMITS_GB, ram_gb)
+    return INSTANCE_TIERS[TIER_TABLE[row][column]]
+
+# Samples between partial report writes during a run, so a killed or crashed
+# run still leaves the numbers collected so far on disk
+CHECKPOINT_SAMPLES = 60
+
+def build_report(image_name, duration, cpu_summary, mem_summary):
+    """Report dict for the given (count, total, peak) CPU and memory summaries."""
+    peak_cpu = cpu_summary[2]
+    peak_mem = mem_summary[2]
+    return {
+        "image": image_name,
+        "duration_sec": duration,
+        "cpu_avg": summary_mean(cpu_summary),
+        "cpu_peak": peak_cpu,
+        "mem_avg_mb": summary_mean(mem_summary),
+        "mem_peak_mb": peak_mem,
+        "recommendation": {
+            "vcpu": max(1, round(peak_cpu / 80)),
+            "ram_gb": round(peak_mem * 1.5 / 1024, 2)  # GB
+        }
+    }
+
+def write_report(path, report):
+    """Write report as JSON through a temporary file, so path never holds half a report."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(report, f, indent=4)
+    os.replace(tmp_path, path)
+
+class EstimationError(Exception):
+    """Raised when an image can't be profiled; the message says why."""
 
-    print(f"\n🔍 Checking if image '{image_name}' is available locally...")
+def estimate_resources(image_name: str, test_duration: int = 30, custom_command: str = None, stop_docker: bool = False,
+                       output_path: str = "resource_report.json", log=print, interval: float = SAMPLE_INTERVAL,
+                       client=None):
+    """
+    Profile a container of image_name for test_duration seconds and return the
+    report dict, also writing it to output_path unless that is None. Progress
+    goes to log (print by default); a sample is taken every interval seconds.
+    Pass client to reuse one Docker client across calls. Raises EstimationError
+    on failure.
+    """
+    if client is None:
+        client = docker.from_env()
+
+    log(f"\n🔍 Checking if image '{image_name}' is available locally...")
     try:
         image = client.images.get(image_name)
-        print("✅ Image found locally.")
+        log("✅ Image found locally.")
     except docker.errors.ImageNotFound:
-        print("⬇️  Image not found locally. Pulling from registry...")
+        log("⬇️  Image not found locally. Pulling from registry...")
         try:
             image = client.images.pull(image_name)
-            print("✅ Image pulled successfully.")
+            log("✅ Image pulled successfully.")
         except docker.errors.APIError as e:
-            print(f"❌ Failed to pull image: {e}")
-            sys.exit(1)
+            raise EstimationError(f"Failed to pull image: {e}")
 
-    print(f"\n🚀 Running container from '{image_name}' for {test_duration}s...")
+    log(f"\n🚀 Running container from '{image_name}' for {test_duration}s...")
     container = None
     try:
         # Use custom command if provided, otherwise use tail -f /dev/null to keep container alive
@@ -81,161 +368,111 @@ def estimate_resources(image_name: str, test_duration: int = 30, custom_command:
         
         container = client.containers.run(image_name, detach=True, command=cmd)
         cmd_display = cmd if isinstance(cmd, str) else ' '.join(cmd)
-        print(f"✅ Container started with command: {cmd_display}")
+        log(f"✅ Container started with command: {cmd_display}")
     except docker.errors.ContainerError as e:
-        print(f"❌ Failed to run container: {e}")
-        sys.exit(1)
+        raise EstimationError(f"Failed to run container: {e}")
     except docker.errors.APIError as e:
         # If tail command failed, try alternative commands
         if "executable file not found" in str(e) and not custom_command:
-            print(f"⚠️  'tail' command not found in image. Trying alternative commands...")
+            log(f"⚠️  'tail' command not found in image. Trying alternative commands...")
             
             # Try sleep infinity
             try:
                 container = client.containers.run(image_name, detach=True, command="sleep infinity")
-                print(f"✅ Container started with command: sleep infinity")
+                log(f"✅ Container started with command: sleep infinity")
             except docker.errors.APIError:
                 # Try sh -c sleep
                 try:
                     container = client.containers.run(image_name, detach=True, command=["/bin/sh", "-c", "sleep infinity"])
-                    print(f"✅ Container started with command: /bin/sh -c sleep infinity")
+                    log(f"✅ Container started with command: /bin/sh -c sleep infinity")
                 except docker.errors.APIError:
                     # Last resort: use image's default command
                     try:
                         container = client.containers.run(image_name, detach=True)
-                        print(f"⚠️  Using image's default command (may exit quickly)")
+                        log(f"⚠️  Using image's default command (may exit quickly)")
                     except docker.errors.APIError as final_e:
-                        print(f"❌ Docker API error: {final_e}")
-                        sys.exit(1)
+                        raise EstimationError(f"Docker API error: {final_e}")
         else:
-            print(f"❌ Docker API error: {e}")
-            sys.exit(1)
+            raise EstimationError(f"Docker API error: {e}")
 
-    cpu_usages = []
-    mem_usages = []
-    previous_cpu = 0
-    previous_system = 0
+    # Only the mean and peak are reported, so keep running sums, not every sample
+    cpu_summary = (0, 0.0, 0.0)  # (count, total, peak)
+    mem_summary = (0, 0.0, 0.0)
 
     try:
-        stats_stream = container.stats(stream=True)
-        start = time.time()
-        sample_count = 0
-        while time.time() - start < test_duration:
-            try:
-                # Check if container is still running
-                container.reload()
-                if container.status != 'running':
-                    print(f"\n⚠️  Container exited with status '{container.status}' after {sample_count} samples.")
-                    print(f"💡 Tip: This image may need a custom command to stay running.")
-                    break
-                
-                stats_raw = next(stats_stream)
-                
-                # Decode stats if it's bytes
-                if isinstance(stats_raw, bytes):
-                    stats = json.loads(stats_raw.decode('utf-8'))
-                else:
-                    stats = stats_raw
-                
-                # Correct CPU calculation using deltas
-                cpu_stats = stats.get("cpu_stats", {})
-                precpu_stats = stats.get("precpu_stats", {})
-                
-                cpu_total = cpu_stats.get("cpu_usage", {}).get("total_usage", 0)
-                precpu_total = precpu_stats.get("cpu_usage", {}).get("total_usage", 0)
-                
-                system_cpu = cpu_stats.get("system_cpu_usage", 0)
-                presystem_cpu = precpu_stats.get("system_cpu_usage", 0)
-                
-                # Calculate deltas
-                cpu_delta = cpu_total - precpu_total
-                system_delta = system_cpu - presystem_cpu
-                
-                # Get number of CPUs
-                online_cpus = cpu_stats.get("online_cpus")
-                if not online_cpus:
-                    percpu_usage = cpu_stats.get("cpu_usage", {}).get("percpu_usage", [])
-                    online_cpus = len(percpu_usage) if percpu_usage else 1
-                
-                # Calculate CPU percentage
-                if system_delta > 0 and cpu_delta >= 0:
-                    cpu_percent = (cpu_delta / system_delta) * online_cpus * 100.0
-                    cpu_usages.append(cpu_percent)
-                
-                # Memory calculation
-                mem_usage = stats.get("memory_stats", {}).get("usage", 0) / (1024 ** 2)
-                mem_usages.append(mem_usage)
-                
-                sample_count += 1
-                time.sleep(1)
-            except (StopIteration, KeyError) as e:
-                # Container exited or stats unavailable
-                print(f"\n⚠️  Container exited or stats unavailable after {sample_count} samples.")
-                break
+        # Both samplers stop early once the container exits: its cgroup is
+        # removed and dockerd answers with an empty stats frame
+        deadline = time.monotonic() + test_duration
+        never_exits = threading.Event()
+        
+        # Read the cgroup files directly when the container runs on this host;
+        # otherwise ask dockerd for stats
+        cgroup_paths = find_cgroup_paths(container.id)
+        if cgroup_paths:
+            log("📂 Sampling from the container's cgroup files")
+            samples = cgroup_samples(cgroup_paths, deadline, never_exits, interval)
+        else:
+            # The low-level API client takes the id directly, without
+            # re-wrapping the container's attrs on every call
+            samples = docker_api_samples(client.api, container.id, deadline, never_exits, interval)
+        
+        for cpu_percent, mem_usage in samples:
+            if cpu_percent is not None:
+                cpu_summary = add_sample(cpu_summary, cpu_percent)
+            mem_summary = add_sample(mem_summary, mem_usage)
+            
+            if output_path and cpu_summary[0] and mem_summary[0] % CHECKPOINT_SAMPLES == 0:
+                partial = build_report(image_name, round(mem_summary[0] * interval, 1), cpu_summary, mem_summary)
+                partial["partial"] = True
+                write_report(output_path, partial)
+        
+        if time.monotonic() < deadline:
+            log(f"\n⚠️  Container exited after {mem_summary[0]} samples.")
+            log("💡 Tip: This image may need a custom command to stay running.")
     except KeyboardInterrupt:
-        print("\n⏹️  Interrupted by user. Stopping container early.")
+        log("\n⏹️  Interrupted by user. Stopping container early.")
     except Exception as e:
-        print(f"\n⚠️  Error during stats collection: {e}")
+        log(f"\n⚠️  Error during stats collection: {e}")
     finally:
         if container:
-            print("🧹 Cleaning up container...")
+            log("🧹 Cleaning up container...")
             try:
-                container.stop()
-                container.remove()
+                # Kill and remove in one call instead of waiting out the 10 s stop timeout
+                client.api.remove_container(container.id, force=True, v=True)
             except Exception as e:
-                print(f"⚠️  Error during cleanup: {e}")
+                log(f"⚠️  Error during cleanup: {e}")
 
-    if not cpu_usages or not mem_usages:
-        print("❌ No stats collected. The container might have exited too early.")
-        sys.exit(1)
+    if not cpu_summary[0] or not mem_summary[0]:
+        raise EstimationError("No stats collected. The container might have exited too early.")
 
-    avg_cpu = statistics.mean(cpu_usages)
-    peak_cpu = max(cpu_usages)
-    avg_mem = statistics.mean(mem_usages)
-    peak_mem = max(mem_usages)
-
-    recommended_vcpu = max(1, round(peak_cpu / 80))
-    recommended_ram = round(peak_mem * 1.5 / 1024, 2)  # GB
-
-    print("\n📊 === Resource Summary ===")
-    print(f"Average CPU: {avg_cpu:.2f}%")
-    print(f"Peak CPU: {peak_cpu:.2f}%")
-    print(f"Average Memory: {avg_mem:.2f} MB")
-    print(f"Peak Memory: {peak_mem:.2f} MB")
-
-    print("\n☁️ === Cloud Estimate ===")
-    print(f"Suggested: {recommended_vcpu} vCPU(s), {recommended_ram} GB RAM")
-
-    print("\n💡 Recommended Instances:")
-    if recommended_vcpu == 1 and recommended_ram <= 1:
-        print("• AWS: t3.micro / GCP: e2-micro / Azure: B1s")
-    elif recommended_vcpu == 1 and recommended_ram <= 2:
-        print("• AWS: t3.small / GCP: e2-small / Azure: B1ms")
-    elif recommended_vcpu == 2:
-        print("• AWS: t3.medium / GCP: e2-medium / Azure: B2s")
-    else:
-        print("• AWS: t3.large+ / GCP: e2-standard / Azure: B2ms+")
+    result = build_report(image_name, test_duration, cpu_summary, mem_summary)
+    avg_cpu, peak_cpu = result["cpu_avg"], result["cpu_peak"]
+    avg_mem, peak_mem = result["mem_avg_mb"], result["mem_peak_mb"]
+    recommended_vcpu = result["recommendation"]["vcpu"]
+    recommended_ram = result["recommendation"]["ram_gb"]
 
-    result = {
-        "image": image_name,
-        "duration_sec": test_duration,
-        "cpu_avg": avg_cpu,
-        "cpu_peak": peak_cpu,
-        "mem_avg_mb": avg_mem,
-        "mem_peak_mb": peak_mem,
-        "recommendation": {
-            "vcpu": recommended_vcpu,
-            "ram_gb": recommended_ram
-        }
-    }
+    log("\n📊 === Resource Summary ===")
+    log(f"Average CPU: {avg_cpu:.2f}%")
+    log(f"Peak CPU: {peak_cpu:.2f}%")
+    log(f"Average Memory: {avg_mem:.2f} MB")
+    log(f"Peak Memory: {peak_mem:.2f} MB")
+
+    log("\n☁️ === Cloud Estimate ===")
+    log(f"Suggested: {recommended_vcpu} vCPU(s), {recommended_ram} GB RAM")
 
-    with open("resource_report.json", "w") as f:
-        json.dump(result, f, indent=4)
-    print("\n📁 Report saved as resource_report.json")
+    log("\n💡 Recommended Instances:")
+    tier = get_instance_recommendations(recommended_vcpu, recommended_ram)
+    log(f"• AWS: {tier['aws']} / GCP: {tier['gcp']} / Azure: {tier['azure']}")
+
+    if output_path:
+        write_report(output_path, result)
+        log(f"\n📁 Report saved as {output_path}")
     
     # Stop Docker Engine if requested
     if stop_docker:
         stop_docker_engine()
+    
+    return result
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -256,6 +493,8 @@ Examples:
     parser.add_argument('--duration', '-d', type=int, help='Test duration in seconds (default: 30)')
     parser.add_argument('--command', '-c', type=str, help='Custom command to run in container (default: tail -f /dev/null)')
     parser.add_argument('--stop-docker', '-s', action='store_true', help='Stop Docker Engine after execution completes')
+    parser.add_argument('--output', '-o', type=str, default='resource_report.json', help='Where to write the JSON report (default: resource_report.json)')
+    parser.add_argument('--interval', '-n', type=float, default=SAMPLE_INTERVAL, help=f'Seconds between samples (default: {SAMPLE_INTERVAL})')
     
     args = parser.parse_args()
     
@@ -276,4 +515,8 @@ Examples:
         stop_docker_input = input("Stop Docker Engine after completion? (y/n) [default=n]: ").strip().lower()
         stop_docker_flag = stop_docker_input == 'y'
     
-    estimate_resources(image, duration, custom_cmd, stop_docker_flag)
+    try:
+        estimate_resources(image, duration, custom_cmd, stop_docker_flag, args.output, interval=args.interval)
+    except EstimationError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
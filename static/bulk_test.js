@@ -0,0 +1,39 @@
+let progressStream;
+
+function startBulkTest() {
+    const duration = document.getElementById('duration').value;
+    const startBtn = document.getElementById('startBtn');
+    const progressSection = document.getElementById('progressSection');
+
+    // Disable button and show progress
+    startBtn.disabled = true;
+    startBtn.textContent = 'Testing in progress...';
+    progressSection.style.display = 'block';
+
+    // Start the test, then listen for progress once it is running so
+    // the stream can't report a previous run as complete
+    fetch('/api/start-bulk-test', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({duration: parseInt(duration)})
+    }).then(() => {
+        progressStream = new EventSource('/api/bulk-test-stream');
+        progressStream.onmessage = event => showProgress(JSON.parse(event.data));
+    });
+}
+
+function showProgress(data) {
+    const percent = (data.current / data.total) * 100;
+    document.getElementById('progressFill').style.width = percent + '%';
+    document.getElementById('progressFill').textContent = Math.round(percent) + '%';
+    document.getElementById('currentImage').textContent = data.phase === 'pulling'
+        ? 'Pulling images...'
+        : (data.current_image || 'Waiting...');
+    document.getElementById('currentProgress').textContent = data.current;
+    document.getElementById('totalImages').textContent = data.total;
+
+    if (data.status === 'complete') {
+        progressStream.close();
+        window.location.href = '/results?type=bulk';
+    }
+}
@@ -0,0 +1,458 @@
+let statsStream = null;
+let monitoring = false;
+let logOffset = 0;
+let containerId;
+let startTime;
+// Last maxDataPoints samples as ring buffers; bufHead is the next slot to write
+const maxDataPoints = 60;
+const cpuData = new Float64Array(maxDataPoints);
+const memData = new Float64Array(maxDataPoints);
+let bufHead = 0;
+let bufLen = 0;
+let charted = 0;  // samples written so far
+// [sample number, value] pairs with falling values; the front is the window's max
+let memMaxQueue = [];
+let autoScroll = true;
+let terminalLines = 0;
+let chunkLines = [];  // line count of each text node in the terminal
+let lastSamples = 0;
+let ui;
+let shown = {};  // text last written to each label, by id
+// Canvas charts; each keeps the scale and sample count it last drew
+let charts;
+let view = {text: [], memMax: 0, phase: 'starting'};
+let pendingLog = '';
+let frameRequested = false;
+const terminalMaxLines = 500;  // lines of output kept in the terminal
+const historyLength = 5;  // samples listed under each chart
+
+// Presets ship as a JSON island and are only parsed once a preset is picked
+let presets;
+
+function getPresets() {
+    if (!presets) {
+        presets = JSON.parse(document.getElementById('presets').textContent);
+    }
+    return presets;
+}
+
+function loadPreset() {
+    const select = document.getElementById('presetSelect');
+    const presetKey = select.value;
+
+    if (!presetKey) {
+        document.getElementById('presetInfo').style.display = 'none';
+        return;
+    }
+
+    const preset = getPresets()[presetKey];
+    document.getElementById('imageName').value = preset.image;
+    document.getElementById('command').value = preset.command;
+    document.getElementById('portMapping').value = preset.port;
+    document.getElementById('presetInfoText').textContent = preset.info;
+    document.getElementById('presetInfo').style.display = 'block';
+}
+
+function startLiveTest() {
+    const imageName = document.getElementById('imageName').value;
+    const command = document.getElementById('command').value;
+    const portMapping = document.getElementById('portMapping').value;
+    const startBtn = document.getElementById('startBtn');
+    const formSection = document.getElementById('formSection');
+    const statsSection = document.getElementById('statsSection');
+
+    if (!imageName) {
+        alert('Please enter an image name');
+        return;
+    }
+
+    startBtn.disabled = true;
+    startBtn.innerHTML = '<div class="spinner" style="width: 20px; height: 20px; border-width: 3px; margin: 0 auto;"></div>';
+
+    fetch('/api/start-live-test', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({
+            image: imageName,
+            command: command || null,
+            port_mapping: portMapping || null
+        })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.status === 'success') {
+            containerId = data.container_id;
+            startTime = Date.now();
+            bufHead = 0;
+            bufLen = 0;
+            charted = 0;
+            memMaxQueue = [];
+            terminalLines = 0;
+            chunkLines = [];
+            lastSamples = 0;
+            view = {text: [], memMax: 0, phase: 'starting'};
+            pendingLog = '';
+            cacheElements();
+            ui.statusBadge.className = 'status-badge starting';
+            ui.statusBadge.textContent = '● Starting…';
+
+            document.getElementById('infoImage').textContent = imageName;
+            document.getElementById('infoContainerId').textContent = containerId.substring(0, 12);
+
+            // Show port mapping and access URL if available
+            if (data.port_info) {
+                document.getElementById('infoImage').textContent = imageName + ' ' + data.port_info;
+
+                // Extract port and create clickable link
+                const portMatch = portMapping.match(/^(\d+):/);
+                if (portMatch) {
+                    const port = portMatch[1];
+                    const url = `http://localhost:${port}`;
+                    document.getElementById('accessUrl').href = url;
+                    document.getElementById('accessUrl').textContent = url;
+                    document.getElementById('accessUrlRow').style.display = 'flex';
+                }
+            }
+
+            formSection.style.display = 'none';
+            statsSection.style.display = 'block';
+            sizeCharts();
+
+            monitoring = true;
+            logOffset = 0;
+            if (!document.hidden) openStatsStream();
+        } else {
+            alert('Failed to start container: ' + (data.error || 'Unknown error'));
+            startBtn.disabled = false;
+            startBtn.textContent = '🚀 Start Container';
+        }
+    })
+    .catch(error => {
+        alert('Error: ' + error);
+        startBtn.disabled = false;
+        startBtn.textContent = '🚀 Start Container';
+    });
+}
+
+// Element lookups are cached so a stats event does no DOM queries
+function cacheElements() {
+    ui = {};
+    shown = {};
+    for (const id of ['infoRuntime', 'infoSamples', 'cpuCurrent', 'cpuPeak', 'cpuAvg',
+                      'memCurrent', 'memPeak', 'memAvg', 'cpuCanvas', 'memCanvas',
+                      'cpuHistory', 'memHistory', 'terminalOutput', 'statusBadge']) {
+        ui[id] = document.getElementById(id);
+    }
+    charts = {
+        cpu: {canvas: ui.cpuCanvas, ctx: ui.cpuCanvas.getContext('2d'), stroke: '#667eea', fill: '#e0e5fb'},
+        mem: {canvas: ui.memCanvas, ctx: ui.memCanvas.getContext('2d'), stroke: '#764ba2', fill: '#e4dbec'}
+    };
+}
+
+// Match each canvas to its displayed size; the next sample redraws it in full
+function sizeCharts() {
+    const scale = window.devicePixelRatio || 1;
+    for (const chart of Object.values(charts)) {
+        chart.canvas.width = Math.round(chart.canvas.clientWidth * scale);
+        chart.canvas.height = Math.round(chart.canvas.clientHeight * scale);
+        chart.lineWidth = 2 * scale;
+        chart.drawn = -1;
+    }
+}
+
+window.addEventListener('resize', () => {
+    if (!charts) return;
+    sizeCharts();
+    drawChart(charts.cpu, cpuData, 100);
+    drawChart(charts.mem, memData, view.memMax * 1.2);
+});
+
+function openStatsStream() {
+    statsStream = new EventSource('/api/live-test-stream?container_id=' + containerId + '&log_offset=' + logOffset);
+    statsStream.onmessage = event => showStats(JSON.parse(event.data));
+    statsStream.onerror = () => {
+        // A 404 (container unknown, e.g. after a server restart) closes the source for good
+        if (statsStream.readyState === EventSource.CLOSED) {
+            showStats({status: 'error', error: 'Container not found'});
+            return;
+        }
+        // Otherwise the browser is reconnecting; stop if the container is gone meanwhile
+        fetch('/api/live-test-stats?container_id=' + containerId + '&log_offset=' + logOffset)
+            .then(response => response.json())
+            .then(data => {
+                if (monitoring && data.status === 'error') showStats(data);
+            })
+            .catch(() => {});
+    };
+}
+
+function closeStatsStream() {
+    if (statsStream) {
+        statsStream.close();
+        statsStream = null;
+    }
+}
+
+// Hidden tabs drop the stream; it resumes from logOffset when shown again
+document.addEventListener('visibilitychange', () => {
+    if (!monitoring) return;
+    if (document.hidden) {
+        closeStatsStream();
+    } else if (!statsStream) {
+        openStatsStream();
+    }
+});
+
+function showStats(data) {
+    if (data.status === 'error') {
+        monitoring = false;
+        closeStatsStream();
+        document.getElementById('statusBadge').className = 'status-badge stopped';
+        document.getElementById('statusBadge').textContent = '● Stopped';
+        alert('Container stopped: ' + data.error);
+        return;
+    }
+
+    // Build every string here; render() then does all the DOM writes in one frame
+    const runtime = Math.floor((Date.now() - startTime) / 1000);
+    view.phase = data.phase;
+    view.text = [
+        ['infoRuntime', runtime + 's'],
+        ['infoSamples', String(data.samples)],
+        ['cpuCurrent', data.cpu_current.toFixed(2) + '%'],
+        ['cpuPeak', data.cpu_peak.toFixed(2) + '%'],
+        ['cpuAvg', data.cpu_avg.toFixed(2) + '%'],
+        ['memCurrent', data.mem_current.toFixed(2) + ' MB'],
+        ['memPeak', data.mem_peak.toFixed(2) + ' MB'],
+        ['memAvg', data.mem_avg.toFixed(2) + ' MB']
+    ];
+
+    // Output-only events repeat the last sample; chart new samples only
+    if (data.samples !== lastSamples) {
+        lastSamples = data.samples;
+
+        cpuData[bufHead] = data.cpu_current;
+        memData[bufHead] = data.mem_current;
+        bufHead = (bufHead + 1) % maxDataPoints;
+        bufLen = Math.min(bufLen + 1, maxDataPoints);
+
+        // Sliding-window max: drop smaller values behind the new one,
+        // then the front once it falls out of the window
+        while (memMaxQueue.length && memMaxQueue[memMaxQueue.length - 1][1] <= data.mem_current) {
+            memMaxQueue.pop();
+        }
+        memMaxQueue.push([charted, data.mem_current]);
+        if (memMaxQueue[0][0] <= charted - maxDataPoints) {
+            memMaxQueue.shift();
+        }
+        charted++;
+        view.memMax = memMaxQueue[0][1];
+    }
+
+    // Each event carries only the output that arrived since the last one
+    logOffset = data.log_total_len;
+    if (data.log_delta) {
+        pendingLog = lastLines(pendingLog + data.log_delta, terminalMaxLines);
+    }
+
+    if (!frameRequested) {
+        frameRequested = true;
+        requestAnimationFrame(render);
+    }
+}
+
+function render() {
+    frameRequested = false;
+
+    // The badge reads "Starting…" until the first stats frame arrives
+    if (view.phase === 'running' && shown.phase !== 'running') {
+        shown.phase = 'running';
+        ui.statusBadge.className = 'status-badge running';
+        ui.statusBadge.textContent = '● Running';
+    }
+
+    // Most labels read the same from one sample to the next; only write changes
+    for (const [id, text] of view.text) {
+        if (shown[id] !== text) {
+            shown[id] = text;
+            ui[id].textContent = text;
+        }
+    }
+
+    if (charts.cpu.drawn !== charted) {
+        drawChart(charts.cpu, cpuData, 100);
+        drawChart(charts.mem, memData, view.memMax * 1.2);
+        updateHistory(ui.cpuHistory, cpuData, '%');
+        updateHistory(ui.memHistory, memData, ' MB');
+    }
+
+    if (pendingLog) {
+        const terminalOutput = ui.terminalOutput;
+        if (chunkLines.length === 0) {
+            terminalOutput.innerHTML = '';
+        }
+        const lines = pendingLog.split('\n').length - 1;
+        terminalOutput.appendChild(document.createTextNode(pendingLog));
+        chunkLines.push(lines);
+        terminalLines += lines;
+        pendingLog = '';
+
+        // Keep the DOM to about the last terminalMaxLines lines
+        while (terminalLines > terminalMaxLines && chunkLines.length > 1) {
+            terminalLines -= chunkLines.shift();
+            terminalOutput.removeChild(terminalOutput.firstChild);
+        }
+
+        if (autoScroll) {
+            terminalOutput.scrollTop = terminalOutput.scrollHeight;
+        }
+    }
+}
+
+function clearTerminal() {
+    document.getElementById('terminalOutput').innerHTML = '<span style="color: #888;">Terminal cleared. New output will appear here...</span>';
+    terminalLines = 0;
+    chunkLines = [];
+}
+
+// The tail of text holding at most n line breaks
+function lastLines(text, n) {
+    let cut = text.length;
+    for (let i = 0; i <= n; i++) {
+        cut = text.lastIndexOf('\n', cut - 1);
+        if (cut < 0) return text;
+    }
+    return text.slice(cut + 1);
+}
+
+function toggleAutoScroll() {
+    autoScroll = !autoScroll;
+    const btn = document.getElementById('autoScrollBtn');
+    btn.textContent = 'Auto-scroll: ' + (autoScroll ? 'ON' : 'OFF');
+    btn.style.background = autoScroll ? '#667eea' : '#666';
+}
+
+// Draw a ring buffer on a chart, oldest sample on the left. While the scale is
+// unchanged and one sample arrived since the last draw, only the newest segment
+// is drawn (after scrolling the rest left once the window is full)
+function drawChart(chart, data, maxVal) {
+    const {canvas, ctx} = chart;
+    const width = canvas.width;
+    const height = canvas.height;
+    // Whole-pixel steps, so scrolled pixels are copied without resampling
+    const xStep = Math.floor(width / (maxDataPoints - 1));
+    const left = width - xStep * (maxDataPoints - 1);
+    const yScale = maxVal > 0 ? height / maxVal : 0;
+    const oldest = bufHead - bufLen + maxDataPoints;
+    const x = i => left + i * xStep;
+    const y = i => height - data[(oldest + i) % maxDataPoints] * yScale;
+
+    ctx.lineWidth = chart.lineWidth;
+    ctx.lineCap = 'round';
+    ctx.lineJoin = 'round';
+    ctx.strokeStyle = chart.stroke;
+    ctx.fillStyle = chart.fill;
+
+    let from = 0;
+    if (chart.drawn === charted - 1 && chart.maxVal === maxVal && bufLen > 1) {
+        from = bufLen - 2;
+        if (bufLen === maxDataPoints) {
+            ctx.drawImage(canvas, -xStep, 0);
+        }
+        ctx.clearRect(x(from), 0, width - x(from), height);
+    } else {
+        ctx.clearRect(0, 0, width, height);
+    }
+    chart.drawn = charted;
+    chart.maxVal = maxVal;
+    if (bufLen < 2) return;
+
+    // The area fill is opaque, so the strips drawn each tick blend seamlessly
+    ctx.beginPath();
+    ctx.moveTo(x(from), height);
+    for (let i = from; i < bufLen; i++) {
+        ctx.lineTo(x(i), y(i));
+    }
+    ctx.lineTo(x(bufLen - 1), height);
+    ctx.fill();
+
+    ctx.beginPath();
+    ctx.moveTo(x(from), y(from));
+    for (let i = from + 1; i < bufLen; i++) {
+        ctx.lineTo(x(i), y(i));
+    }
+    ctx.stroke();
+}
+
+// Show the last historyLength samples of a ring buffer, newest first. Rows are
+// only added while the list fills; after that each sample rewrites their text
+function updateHistory(el, data, unit) {
+    const count = Math.min(bufLen, historyLength);
+    const relabel = el.children.length !== count;
+    while (el.children.length > count) {
+        el.lastElementChild.remove();
+    }
+    while (el.children.length < count) {
+        el.insertAdjacentHTML('beforeend', '<div class="history-item"><span></span><span><strong></strong></span></div>');
+    }
+
+    for (let idx = 0; idx < count; idx++) {
+        const row = el.children[idx];
+        if (relabel) {
+            row.firstElementChild.textContent = (count - idx) + ' sample(s) ago:';
+        }
+        const val = data[(bufHead - 1 - idx + maxDataPoints) % maxDataPoints];
+        row.lastElementChild.firstElementChild.textContent = val.toFixed(2) + unit;
+    }
+}
+
+function stopLiveTest() {
+    if (!containerId) return;
+
+    if (!confirm('Are you sure you want to stop the container?')) {
+        return;
+    }
+
+    monitoring = false;
+    closeStatsStream();
+
+    fetch('/api/stop-live-test', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({container_id: containerId})
+    })
+    .then(response => response.json())
+    .then(data => {
+        document.getElementById('statusBadge').className = 'status-badge stopped';
+        document.getElementById('statusBadge').textContent = '● Stopped';
+        document.getElementById('stopBtn').disabled = true;
+
+        // Display recommendations if available
+        if (data.recommendations) {
+            const rec = data.recommendations;
+            const stats = rec.stats;
+
+            document.getElementById('recVcpu').textContent = rec.vcpu;
+            document.getElementById('recRam').textContent = rec.ram_gb;
+            document.getElementById('recCpuPeak').textContent = stats.cpu_peak + '%';
+            document.getElementById('recMemPeak').textContent = stats.mem_peak_mb.toFixed(2) + ' MB';
+            document.getElementById('recCpuAvg').textContent = stats.cpu_avg + '%';
+            document.getElementById('recMemAvg').textContent = stats.mem_avg_mb.toFixed(2) + ' MB';
+            document.getElementById('recSamples').textContent = stats.samples;
+            document.getElementById('recDuration').textContent = stats.duration_sec;
+            document.getElementById('recAws').textContent = rec.instances.aws;
+            document.getElementById('recGcp').textContent = rec.instances.gcp;
+            document.getElementById('recAzure').textContent = rec.instances.azure;
+
+            document.getElementById('recommendationSection').style.display = 'block';
+
+            // Scroll to recommendations
+            document.getElementById('recommendationSection').scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+        }
+
+        alert('Container stopped successfully! See recommendations below.');
+    })
+    .catch(error => {
+        alert('Error stopping container: ' + error);
+    });
+}
@@ -0,0 +1,42 @@
+function startSingleTest(event) {
+    event.preventDefault();
+
+    const imageName = document.getElementById('imageName').value;
+    const duration = document.getElementById('duration').value;
+    const command = document.getElementById('command').value;
+    const testBtn = document.getElementById('testBtn');
+    const progressSection = document.getElementById('progressSection');
+
+    // Show progress
+    testBtn.disabled = true;
+    testBtn.textContent = 'Testing...';
+    progressSection.style.display = 'block';
+
+    // Submit test
+    fetch('/api/start-single-test', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({
+            image: imageName,
+            duration: parseInt(duration),
+            command: command || null
+        })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.status === 'success') {
+            window.location.href = '/results?type=single&t=' + encodeURIComponent(data.token);
+        } else {
+            alert('Test failed: ' + (data.error || 'Unknown error'));
+            testBtn.disabled = false;
+            testBtn.textContent = '🚀 Start Test';
+            progressSection.style.display = 'none';
+        }
+    })
+    .catch(error => {
+        alert('Error: ' + error);
+        testBtn.disabled = false;
+        testBtn.textContent = '🚀 Start Test';
+        progressSection.style.display = 'none';
+    });
+}
@@ -0,0 +1,147 @@
+"""Tests for the web app that need no Docker daemon."""
+
+import collections
+import gzip
+import threading
+import time
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+
+def test_single_result_page_only_gzipped_when_accepted(client):
+    response = client.get('/results?type=single', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in response.headers
+    assert b'<html' in response.data.lower()
+
+    response = client.get('/results?type=single', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert b'<html' in gzip.decompress(response.data).lower()
+
+
+def test_progress_events(monkeypatch):
+    monkeypatch.setattr(app, "PROGRESS_KEEPALIVE", 0.01)
+    monkeypatch.setattr(app, "progress_view", ('running', 'measuring', 1, 3, 1, 'nginx:latest', 'job-1'))
+    events = app.progress_events()
+
+    first = next(events)
+    assert first.startswith(b'data: ') and first.endswith(b'\n\n')
+    assert app.json_loads(first[6:]) == {
+        'status': 'running', 'phase': 'measuring', 'current': 1, 'total': 3,
+        'successful': 1, 'current_image': 'nginx:latest', 'version': 'job-1'
+    }
+    # Nothing changed: a comment keeps the connection open
+    assert next(events) == b': keep-alive\n\n'
+
+    monkeypatch.setattr(app, "progress_view", ('complete', '', 3, 3, 3, '', 'job-2'))
+    assert app.json_loads(next(events)[6:])['status'] == 'complete'
+    # A complete run ends the stream
+    assert list(events) == []
+
+
+def test_bulk_progress_poll_answers_304_when_unchanged(client, monkeypatch):
+    monkeypatch.setattr(app, "progress_view", ('running', 'measuring', 1, 3, 1, 'nginx:latest', 'job-1'))
+    response = client.get('/api/bulk-test-progress')
+    assert response.json['current'] == 1
+    etag = response.headers['ETag']
+    assert client.get('/api/bulk-test-progress', headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_cpu_percent_from_stats():
+    stats = {
+        "cpu_stats": {"cpu_usage": {"total_usage": 300}, "system_cpu_usage": 2000, "online_cpus": 2},
+        "precpu_stats": {"cpu_usage": {"total_usage": 100}, "system_cpu_usage": 1000},
+    }
+    cpu_scale = app.cpu_scale_from_stats(stats)
+    assert cpu_scale == 200.0
+    assert app.cpu_percent_from_stats(stats, cpu_scale) == 40.0
+    # The first frame of a stream has an empty precpu_stats
+    assert app.cpu_percent_from_stats({"cpu_stats": stats["cpu_stats"], "precpu_stats": {}}, cpu_scale) is None
+
+
+def test_cpu_scale_falls_back_to_percpu_usage():
+    assert app.cpu_scale_from_stats({"cpu_stats": {"cpu_usage": {"percpu_usage": [1, 2, 3]}}}) == 300.0
+    assert app.cpu_scale_from_stats({}) == 100.0
+
+
+def test_static_page_revalidates_per_encoding(client):
+    plain = client.get('/', headers={'Accept-Encoding': 'identity'})
+    gzipped = client.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert plain.headers['ETag'] != gzipped.headers['ETag']
+    assert 'no-cache' in gzipped.headers['Cache-Control']
+
+    again = client.get('/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': gzipped.headers['ETag']})
+    assert again.status_code == 304
+    # The other encoding's tag must not revalidate this one
+    other = client.get('/', headers={'Accept-Encoding': 'identity', 'If-None-Match': gzipped.headers['ETag']})
+    assert other.status_code == 200
+
+
+def live_info():
+    return {'changed': threading.Condition(), 'log': collections.deque(), 'log_kept': 0, 'log_total': 0}
+
+
+def follow_output(chunks, limit, monkeypatch):
+    class Container:
+        def logs(self, stream, follow):
+            return iter(chunks)
+
+    monkeypatch.setattr(app, "LIVE_LOG_LIMIT", limit)
+    container_info = live_info()
+    app.follow_live_logs(container_info, Container())
+    deadline = time.monotonic() + 5
+    while container_info['log_total'] < sum(len(c.decode('utf-8', 'ignore')) for c in chunks):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    return container_info
+
+
+def test_log_delta_counts_characters_across_split_utf8(monkeypatch):
+    # "é" and "✓" are split across chunks; offsets count decoded characters
+    text = "héllo ✓ wörld"
+    data = text.encode()
+    chunks = [data[:2], data[2:8], data[8:9], data[9:]]
+    container_info = follow_output(chunks, 1000, monkeypatch)
+
+    assert app.log_delta(container_info, 0) == (text, len(text))
+    assert app.log_delta(container_info, 6) == (text[6:], len(text))
+    assert app.log_delta(container_info, len(text)) == ("", len(text))
+
+
+def test_log_delta_keeps_at_least_the_limit(monkeypatch):
+    chunks = [b"abc", b"defg", b"0123456789XYZ", b"q"]
+    container_info = follow_output(chunks, 10, monkeypatch)
+
+    assert container_info['log_total'] == 21
+    assert container_info['log_kept'] >= 10
+    # Offsets older than the kept text get all of it
+    kept = app.log_delta(container_info, 0)[0]
+    assert kept.endswith("3456789XYZq")
+    assert app.log_delta(container_info, 18) == ("YZq", 21)
+
+
+@pytest.mark.skipif(app.brotli is None, reason="brotli is not installed")
+def test_static_page_negotiates_encoding(client):
+    response = client.get('/', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert response.data == app.HOME_HTML_BR
+
+    response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == app.HOME_HTML
+
+    response = client.get('/', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.data == app.HOME_HTML
+    assert response.headers['Vary'] == 'Accept-Encoding'
+
+
+def test_summarize_samples():
+    assert app.summarize_samples([(None, 1.0), (10.0, 2.0), (30.0, 6.0)]) == (20.0, 30.0, 3.0, 6.0, 3)
+    assert app.summarize_samples([(None, 1.0)]) is None
@@ -0,0 +1,214 @@
+"""Tests for the estimator's stats parsing and sampling; no Docker daemon needed."""
+
+import json
+
+import pytest
+import requests
+
+import docker_resource_estimator as estimator
+
+
+def stats_frame(total_usage, system_cpu, mem_usage, online_cpus=2):
+    """A stats frame laid out the way dockerd writes it: compact, in field order."""
+    frame = {
+        "read": "2025-01-01T00:00:00Z",
+        "cpu_stats": {
+            "cpu_usage": {"total_usage": total_usage, "usage_in_kernelmode": 10, "usage_in_usermode": 20},
+            "system_cpu_usage": system_cpu,
+            "online_cpus": online_cpus,
+        },
+        "memory_stats": {"usage": mem_usage, "limit": 1 << 30},
+    }
+    return json.dumps(frame, separators=(",", ":")).encode()
+
+
+class FakeResponse:
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} error")
+
+
+class FakeApi:
+    """Answers one-shot stats GETs from a list of raw frames or FakeResponses."""
+    base_url = "http+docker://localhost"
+    api_version = "1.43"
+    timeout = 60
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.requests = []
+
+    def get(self, url, params, timeout):
+        self.requests.append((url, params))
+        frame = self.frames.pop(0)
+        return frame if isinstance(frame, FakeResponse) else FakeResponse(frame)
+
+
+class NeverExited:
+    """Stands in for the exit Event without waiting out the sampling ticks."""
+
+    def wait(self, timeout=None):
+        return False
+
+
+def test_stats_fields_fast_path():
+    assert estimator.stats_fields(stats_frame(500, 9000, 4096)) == (500, 9000, 4096)
+
+
+def test_stats_fields_fast_path_skips_percpu_usage():
+    raw = (b'{"cpu_stats":{"cpu_usage":{"total_usage":7,"percpu_usage":[3,4]},"system_cpu_usage":11},'
+           b'"memory_stats":{"usage":13}}')
+    assert estimator.CPU_FIELDS_RE.search(raw)
+    assert estimator.stats_fields(raw) == (7, 11, 13)
+
+
+def test_stats_fields_falls_back_to_full_parse():
+    # Pretty-printed and reordered, as another engine might send it
+    raw = json.dumps({
+        "memory_stats": {"usage": 42},
+        "cpu_stats": {"system_cpu_usage": 900, "cpu_usage": {"total_usage": 300}},
+    }, indent=2).encode()
+    assert estimator.CPU_FIELDS_RE.search(raw) is None
+    assert estimator.stats_fields(raw) == (300, 900, 42)
+
+
+def test_stats_fields_empty_frame_raises_key_error():
+    with pytest.raises(KeyError):
+        estimator.stats_fields(b'{"read":"0001-01-01T00:00:00Z","cpu_stats":{"cpu_usage":{}},"memory_stats":{}}')
+    # A frame without system_cpu_usage can't give a CPU figure either
+    with pytest.raises(KeyError):
+        estimator.stats_fields(b'{"cpu_stats":{"cpu_usage":{"total_usage":1}},"memory_stats":{"usage":1}}')
+
+
+def test_stats_online_cpus():
+    assert estimator.stats_online_cpus(stats_frame(1, 1, 1, online_cpus=4)) == 4
+    assert estimator.stats_online_cpus(b'{"cpu_stats":{"cpu_usage":{"percpu_usage":[1,2,3]}}}') == 3
+    assert estimator.stats_online_cpus(b'{"cpu_stats":{"cpu_usage":{}}}') == 1
+
+
+def test_fetch_stats_makes_one_shot_request():
+    api = FakeApi([b"{}"])
+    assert estimator.fetch_stats(api, "abc") == b"{}"
+    assert api.requests == [
+        ("http+docker://localhost/v1.43/containers/abc/stats", {"stream": "false", "one-shot": "true"})
+    ]
+
+
+def test_docker_api_samples_deltas_until_empty_frame():
+    api = FakeApi([
+        stats_frame(1000, 10000, 1 << 20),
+        stats_frame(2000, 20000, 2 << 20),
+        stats_frame(2500, 30000, 3 << 20),
+        b'{"cpu_stats":{},"memory_stats":{}}',
+    ])
+    samples = estimator.docker_api_samples(api, "abc", float("inf"), NeverExited())
+    # The first frame has nothing to diff against; 2 online CPUs scale the rest
+    assert list(samples) == [(None, 1.0), (20.0, 2.0), (10.0, 3.0)]
+
+
+def test_docker_api_samples_keeps_samples_on_http_error():
+    api = FakeApi([
+        stats_frame(1000, 10000, 1 << 20),
+        stats_frame(2000, 20000, 2 << 20),
+        FakeResponse(b'{"message":"No such container: abc"}', status_code=404),
+    ])
+    samples = estimator.docker_api_samples(api, "abc", float("inf"), NeverExited())
+    assert list(samples) == [(None, 1.0), (20.0, 2.0)]
+
+
+def test_find_cgroup_paths_v2_and_v1(tmp_path, monkeypatch):
+    monkeypatch.setattr(estimator, "CGROUP_ROOT", str(tmp_path))
+    monkeypatch.setattr(estimator.sys, "platform", "linux")
+    v2 = tmp_path / "system.slice" / "docker-abc.scope"
+    v2.mkdir(parents=True)
+    (v2 / "cpu.stat").write_text("usage_usec 10\n")
+    (v2 / "memory.current").write_text("20\n")
+    cpu_v1 = tmp_path / "cpuacct" / "docker" / "def"
+    mem_v1 = tmp_path / "memory" / "docker" / "def"
+    cpu_v1.mkdir(parents=True)
+    mem_v1.mkdir(parents=True)
+    (cpu_v1 / "cpuacct.usage").write_text("10000\n")
+    (mem_v1 / "memory.usage_in_bytes").write_text("20\n")
+
+    assert estimator.find_cgroup_paths("abc") == (str(v2 / "cpu.stat"), str(v2 / "memory.current"))
+    assert estimator.find_cgroup_paths("def") == (str(cpu_v1 / "cpuacct.usage"), str(mem_v1 / "memory.usage_in_bytes"))
+    assert estimator.find_cgroup_paths("missing") is None
+
+
+def test_parse_cgroup_cpu_ns():
+    assert estimator.parse_cgroup_cpu_ns(b"usage_usec 1500\nuser_usec 1000\n", "/x/cpu.stat") == 1500000
+    assert estimator.parse_cgroup_cpu_ns(b"1500000\n", "/x/cpuacct.usage") == 1500000
+    with pytest.raises(ValueError):
+        estimator.parse_cgroup_cpu_ns(b"user_usec 1000\n", "/x/cpu.stat")
+
+
+def test_cgroup_samples(tmp_path, monkeypatch):
+    cpu_path = tmp_path / "cpu.stat"
+    mem_path = tmp_path / "memory.current"
+    cpu_path.write_text("usage_usec 1000000\n")
+    mem_path.write_text(str(5 << 20))
+    readings = iter([0.0, 0.0, 2.0, 2.0, 4.0])
+
+    def monotonic():
+        now = next(readings)
+        if now == 0.0:
+            # After the baseline read, before the first sample
+            cpu_path.write_text("usage_usec 2000000\n")
+        return now
+
+    monkeypatch.setattr(estimator.time, "monotonic", monotonic)
+
+    samples = estimator.cgroup_samples((str(cpu_path), str(mem_path)), 3.0, NeverExited())
+    # One more CPU second over two seconds of wall time is half a core
+    assert next(samples) == (50.0, 5.0)
+    # The deadline has passed after the next sample
+    assert list(samples) == [(0.0, 5.0)]
+
+
+def test_cgroup_samples_stop_when_the_cgroup_disappears(tmp_path):
+    cpu_path = tmp_path / "cpu.stat"
+    mem_path = tmp_path / "memory.current"
+    cpu_path.write_text("usage_usec 1000000\n")
+    mem_path.write_text(str(5 << 20))
+
+    samples = estimator.cgroup_samples((str(cpu_path), str(mem_path)), float("inf"), NeverExited(), interval=0)
+    assert next(samples)[1] == 5.0
+    # pread on the open file fails to parse once it is emptied, as when the
+    # runtime removes the cgroup
+    cpu_path.write_text("")
+    assert list(samples) == []
+
+
+def test_add_sample():
+    summary = (0, 0.0, 0.0)
+    for value in (3.0, 9.0, 6.0):
+        summary = estimator.add_sample(summary, value)
+    assert summary == (3, 18.0, 9.0)
+    assert estimator.summary_mean(summary) == 6.0
+    assert estimator.summary_mean((0, 0.0, 0.0)) == 0
+
+
+@pytest.mark.parametrize("vcpu, ram_gb, aws", [
+    (1, 0.5, "t3.micro"),
+    (1, 1, "t3.micro"),
+    (1, 1.5, "t3.small"),
+    (1, 2, "t3.small"),
+    (1, 3, "t3.large+"),
+    (2, 0.5, "t3.medium"),
+    (2, 16, "t3.medium"),
+    (4, 0.5, "t3.large+"),
+])
+def test_instance_tiers(vcpu, ram_gb, aws):
+    assert estimator.get_instance_recommendations(vcpu, ram_gb)["aws"] == aws
+
+
+def test_write_report_replaces_atomically(tmp_path):
+    path = str(tmp_path / "report.json")
+    estimator.write_report(path, {"partial": True})
+    estimator.write_report(path, {"cpu_avg": 1.5})
+    assert json.loads((tmp_path / "report.json").read_text()) == {"cpu_avg": 1.5}
+    assert [p.name for p in tmp_path.iterdir()] == ["report.json"]
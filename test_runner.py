@@ -10,13 +10,18 @@ Usage:
     python test_runner.py --quick
 """
 
-import subprocess
 import json
+import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import argparse
 
+import docker
+
+from docker_resource_estimator import estimate_resources, EstimationError
+
 # Test configurations: (image_name, custom_command, description)
 TEST_IMAGES = [
     {
@@ -42,7 +47,6 @@ TEST_IMAGES = [
         "command": None,  # Postgres exits without POSTGRES_PASSWORD, use tail fallback
         "description": "PostgreSQL Database",
         "category": "Databases",
-        "startup_delay": 5,  # Extra time for DB initialization
         "needs_env": True  # Flag that this needs environment variables
     },
     {
@@ -83,6 +87,13 @@ TEST_IMAGES = [
     },
 ]
 
+# Images tested at once: each runs its own container and sampling thread, so
+# stay well below the core count to keep the measurements from skewing each other
+DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+
+# Concurrent image pulls before testing starts
+PULL_WORKERS = 4
+
 # Quick test subset (for faster testing)
 QUICK_TEST_IMAGES = [
     {
@@ -112,49 +123,77 @@ QUICK_TEST_IMAGES = [
 ]
 
 
-def run_estimation(image_name, duration, custom_command=None, startup_delay=0):
+def image_logger(image_name):
+    """
+    Log function for one image's estimation. Images run side by side, so only the
+    estimator's warnings are printed, tagged with the image name; the runner
+    prints its own per-image summary.
+    """
+    def log(message):
+        if "⚠️" in message:
+            print(f"   [{image_name}] {message.strip()}")
+    return log
+
+
+def run_estimation(image_name, duration, custom_command=None, client=None):
     """Run resource estimation for a single image."""
-    cmd = [
-        sys.executable,
-        "docker_resource_estimator.py",
-        "--image", image_name,
-        "--duration", str(duration)
-    ]
-    
-    if custom_command:
-        cmd.extend(["--command", custom_command])
-    
-    # Calculate timeout with startup delay buffer
-    timeout = duration + 30 + startup_delay
-    
+    # EstimationError messages say why an image couldn't be profiled
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='ignore',  # Ignore encoding errors from Docker output
-            timeout=timeout  # Extended timeout for slow-starting containers
-        )
-        
-        if result.returncode == 0:
-            # Read the generated report
-            try:
-                with open("resource_report.json", "r") as f:
-                    return json.load(f)
-            except FileNotFoundError:
-                return {"error": "Report file not found"}
-        else:
-            return {
-                "error": result.stderr or "Process failed",
-                "returncode": result.returncode
-            }
-    except subprocess.TimeoutExpired:
-        return {"error": "Test timed out"}
+        return estimate_resources(image_name, duration, custom_command, output_path=None,
+                                  log=image_logger(image_name), client=client)
+    except EstimationError as e:
+        return {"error": str(e)}
     except Exception as e:
+        print(f"   [{image_name}] ⚠️  Unexpected error: {e!r}")
         return {"error": str(e)}
 
 
+def pull_images(client, image_names):
+    """
+    Pull the images that aren't available locally, several at a time, so the
+    estimations start with warm images. Returns {image name: error message}
+    for the pulls that failed.
+    """
+    local_tags = {tag for image in client.images.list() for tag in image.tags}
+    missing = [name for name in image_names if name not in local_tags]
+    if not missing:
+        return {}
+    
+    print(f"⬇️  Pulling {len(missing)} image(s) not found locally...")
+    
+    def pull(name):
+        try:
+            client.images.pull(name)
+            return None
+        except docker.errors.APIError as e:
+            return str(e)
+    
+    errors = {}
+    with ThreadPoolExecutor(max_workers=PULL_WORKERS) as pool:
+        futures = {pool.submit(pull, name): name for name in missing}
+        for future in as_completed(futures):
+            name = futures[future]
+            error = future.result()
+            if error:
+                errors[name] = error
+                print(f"   ❌ {name}: {error}")
+            else:
+                print(f"   ✅ {name}")
+    return errors
+
+
+def timed_estimation(image_config, duration, client=None):
+    """Run one configured image; returns (result, elapsed seconds)."""
+    start = time.time()
+    result = run_estimation(
+        image_config['name'],
+        duration,
+        image_config['command'],
+        client
+    )
+    return result, time.time() - start
+
+
 def format_size(mb):
     """Format memory size."""
     if mb < 1:
@@ -194,32 +233,26 @@ def generate_comparison_table(results):
     print("📊 COMPARISON TABLE")
     print_separator()
     
-    # Group by category
+    # Format each row while grouping by category, in one pass
     categories = {}
-    for img, res in results.items():
-        if "error" not in res:
-            category = res.get("category", "Other")
-            if category not in categories:
-                categories[category] = []
-            categories[category].append((img, res))
-    
-    # Print each category
-    for category, items in categories.items():
-        print(f"\n{category}")
-        print("-" * 80)
-        print(f"{'Image':<25} {'CPU Peak':<12} {'RAM Peak':<15} {'Recommendation':<30}")
-        print("-" * 80)
+    for img_name, res in results.items():
+        if "error" in res:
+            continue
+        cpu_peak = f"{res['cpu_peak']:.2f}%"
+        ram_peak = format_size(res['mem_peak_mb'])
+        rec = f"{res['recommendation']['vcpu']} vCPU, {res['recommendation']['ram_gb']} GB"
         
-        for img_name, res in items:
-            cpu_peak = f"{res['cpu_peak']:.2f}%"
-            ram_peak = format_size(res['mem_peak_mb'])
-            rec = f"{res['recommendation']['vcpu']} vCPU, {res['recommendation']['ram_gb']} GB"
-            
-            # Truncate long image names
-            display_name = img_name if len(img_name) <= 24 else img_name[:21] + "..."
-            
-            print(f"{display_name:<25} {cpu_peak:<12} {ram_peak:<15} {rec:<30}")
-
+        # Truncate long image names
+        display_name = img_name if len(img_name) <= 24 else img_name[:21] + "..."
+        
+        categories.setdefault(res.get("category", "Other"), []).append(
+            f"{display_name:<25} {cpu_peak:<12} {ram_peak:<15} {rec:<30}"
+        )
+    
+    # Print each category with a single write
+    header = f"{'Image':<25} {'CPU Peak':<12} {'RAM Peak':<15} {'Recommendation':<30}"
+    for category, rows in categories.items():
+        sys.stdout.write("\n".join([f"\n{category}", "-" * 80, header, "-" * 80, *rows]) + "\n")
 
 def save_full_report(results, duration, test_time):
     """Save comprehensive report to JSON."""
@@ -267,6 +300,13 @@ def main():
         help='Test only a specific image (e.g., nginx:latest)'
     )
     
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Images to test at the same time (default: {DEFAULT_WORKERS})'
+    )
+    
     args = parser.parse_args()
     
     # Select test set
@@ -284,13 +324,17 @@ def main():
     else:
         test_set = TEST_IMAGES
     
+    workers = max(1, min(args.workers, len(test_set)))
+    rounds = (len(test_set) + workers - 1) // workers
+    
     print("=" * 80)
     print("🐳 DOCKER RESOURCE ESTIMATOR - AUTOMATED TEST SUITE")
     print("=" * 80)
     print(f"\nTest Configuration:")
     print(f"  • Images to test: {len(test_set)}")
+    print(f"  • Images tested at once: {workers}")
     print(f"  • Duration per image: {args.duration} seconds")
-    print(f"  • Estimated total time: ~{len(test_set) * (args.duration + 10)} seconds")
+    print(f"  • Estimated total time: ~{rounds * (args.duration + 10)} seconds")
     print()
     
     response = input("Start testing? (y/n): ").strip().lower()
@@ -304,36 +348,50 @@ def main():
     results = {}
     test_time = datetime.now().isoformat()
     
-    for idx, image_config in enumerate(test_set, 1):
-        print(f"\n⏱️  [{idx}/{len(test_set)}] Starting test for {image_config['name']}...")
-        
-        # Add startup delay if configured
-        startup_delay = image_config.get('startup_delay', 0)
-        if startup_delay > 0:
-            print(f"   ⏳ Allowing {startup_delay}s extra for container initialization...")
-        
-        start = time.time()
-        result = run_estimation(
-            image_config['name'],
-            args.duration,
-            image_config['command'],
-            startup_delay
-        )
-        elapsed = time.time() - start
-        
-        # Add metadata to result
-        if "error" not in result:
-            result["category"] = image_config["category"]
-            result["description"] = image_config["description"]
-        
-        results[image_config['name']] = result
-        
-        success = print_result(image_config, result, idx, len(test_set))
-        print(f"   Time elapsed: {elapsed:.1f}s")
+    # One client for the whole run instead of a new connection per image
+    try:
+        client = docker.from_env()
+    except docker.errors.DockerException as e:
+        print(f"⚠️  Could not connect to Docker: {e}")
+        client = None
+    
+    # Pull everything up front so registry downloads stay out of the measurements
+    pull_errors = {}
+    if client is not None:
+        try:
+            pull_errors = pull_images(client, [img['name'] for img in test_set])
+        except docker.errors.DockerException as e:
+            print(f"⚠️  Could not pre-pull images: {e}")
+    
+    for idx, image_config in enumerate([img for img in test_set if img['name'] in pull_errors], 1):
+        results[image_config['name']] = {"error": f"Failed to pull image: {pull_errors[image_config['name']]}"}
+        print_result(image_config, results[image_config['name']], idx, len(test_set))
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for image_config in test_set:
+            if image_config['name'] in pull_errors:
+                continue
+            print(f"\n⏱️  Starting test for {image_config['name']}...")
+            futures[pool.submit(timed_estimation, image_config, args.duration, client)] = image_config
         
-        # Small delay between tests
-        if idx < len(test_set):
-            time.sleep(2)
+        # Report each image as soon as its test finishes
+        for idx, future in enumerate(as_completed(futures), len(pull_errors) + 1):
+            image_config = futures[future]
+            result, elapsed = future.result()
+            
+            # Add metadata to result
+            if "error" not in result:
+                result["category"] = image_config["category"]
+                result["description"] = image_config["description"]
+            
+            results[image_config['name']] = result
+            
+            success = print_result(image_config, result, idx, len(test_set))
+            print(f"   Time elapsed: {elapsed:.1f}s")
+    
+    # Keep the report in configuration order rather than completion order
+    results = {img['name']: results[img['name']] for img in test_set}
     
     # Print summary
     print("\n")